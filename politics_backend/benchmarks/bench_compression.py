@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compression ratio and time for feed-sized JSON bodies.
+
+Usage (from the directory containing manage.py):
+    python benchmarks/bench_compression.py [items ...]
+
+Uses the codecs configured in users.compression (gzip always; br and zstd
+when the optional packages are installed) on synthetic /api/active-info/
+pages. The "cached" column is the cost of serving a stored compressed
+variant from a feed_cache entry, i.e. a dict lookup.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from users import compression  # noqa: E402
+
+DEFAULT_SIZES = [10, 100, 1000, 5000]
+ROUNDS = 20
+
+
+def make_user(user_id):
+    return {
+        'id': user_id, 'email': f'user{user_id}@example.com', 'fullname': f'User {user_id}',
+        'role': 'user', 'is_approved': True, 'is_user': False, 'is_superuser': user_id < 3,
+        'created_at': '2026-01-27T10:30:00Z', 'approval_date': '2026-01-28T09:00:00Z',
+    }
+
+
+def make_feed(items):
+    return json.dumps([
+        {
+            'id': i,
+            'heading': f'Ward {i % 40} meeting moved to community hall',
+            'description': ' '.join(f'word{(i * 7 + j) % 500}' for j in range(80)),
+            'image': f'/media/active_info/photo_{i}.jpeg',
+            'submitted_by': make_user(10 + i % 200),
+            'approved_by': make_user(i % 3),
+            'approved_at': '2026-02-01T12:00:00Z',
+            'created_at': '2026-02-01T12:00:00Z',
+        }
+        for i in range(items)
+    ], separators=(',', ':')).encode()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = func(*args)
+    return result, (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main(sizes):
+    print(f"{'items':>6} {'coding':>6} {'raw KB':>9} {'packed KB':>10} {'ratio':>7} {'compress ms':>12} {'cached ms':>10}")
+    for items in sizes:
+        body = make_feed(items)
+        for coding in compression.CODECS:
+            packed, compress_ms = timed(compression.compress, coding, body)
+            encodings = {coding: packed}
+            _, cached_ms = timed(encodings.get, coding)
+            print(f"{items:>6} {coding:>6} {len(body) / 1024:>9.1f} {len(packed) / 1024:>10.1f} "
+                  f"{len(body) / len(packed):>7.1f} {compress_ms:>12.3f} {cached_ms:>10.4f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Compare settings profiles: worker cold start, import cost and per-request
+middleware overhead.
+
+Usage (from the directory containing manage.py):
+    python benchmarks/bench_settings_profiles.py
+    python benchmarks/bench_settings_profiles.py politics_backend.settings politics_backend.settings_api
+
+Each profile is measured in fresh subprocesses, since Django settings can
+only be configured once per process. The request benchmark calls
+/api/protected/, which does not touch the database, so the numbers isolate
+the handler and middleware stack.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_PROFILES = ['politics_backend.settings', 'politics_backend.settings_api']
+COLD_START_RUNS = 5
+REQUESTS = 2000
+
+COLD_START_CODE = """
+import json, sys, time
+start = time.perf_counter()
+from politics_backend.wsgi import application
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'modules': len(sys.modules)}))
+"""
+
+REQUEST_CODE = """
+import json, sys, time
+from io import BytesIO
+from politics_backend.wsgi import application
+from django.conf import settings
+from django.urls import resolve
+from django.test import RequestFactory
+
+count = int(sys.argv[1])
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': '/api/protected/', 'QUERY_STRING': '',
+    'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+    'wsgi.url_scheme': 'http', 'wsgi.input': BytesIO(b''), 'wsgi.errors': sys.stderr,
+}
+
+def start_response(status, headers):
+    pass
+
+def run_full():
+    for _ in range(count):
+        env = dict(environ, **{'wsgi.input': BytesIO(b'')})
+        b''.join(application(env, start_response))
+
+view = resolve('/api/protected/').func
+factory = RequestFactory(HTTP_HOST='localhost')
+
+def run_view():
+    for _ in range(count):
+        view(factory.get('/api/protected/')).render()
+
+results = {}
+for name, func in (('full', run_full), ('view', run_view)):
+    func()  # warm up
+    start = time.perf_counter()
+    func()
+    results[name] = (time.perf_counter() - start) / count * 1e6
+results['middleware'] = len(settings.MIDDLEWARE)
+print(json.dumps(results))
+"""
+
+
+def run(profile, code, *args):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=profile)
+    output = subprocess.run(
+        [sys.executable, '-c', code, *args],
+        cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(profiles):
+    print(f"{'profile':<40} {'cold start ms':>14} {'modules':>8} {'middleware':>10} "
+          f"{'request us':>11} {'view us':>8} {'overhead us':>12}")
+    for profile in profiles:
+        starts = [run(profile, COLD_START_CODE) for _ in range(COLD_START_RUNS)]
+        cold_ms = statistics.median(s['seconds'] for s in starts) * 1000
+        req = run(profile, REQUEST_CODE, str(REQUESTS))
+        print(f"{profile:<40} {cold_ms:>14.1f} {starts[0]['modules']:>8} {req['middleware']:>10} "
+              f"{req['full']:>11.1f} {req['view']:>8.1f} {req['full'] - req['view']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or DEFAULT_PROFILES)
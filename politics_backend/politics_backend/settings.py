@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'users.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,6 +57,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'users.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'politics_backend.urls'
@@ -88,6 +90,14 @@ DATABASES = {
         'PASSWORD': '',
         'HOST': 'localhost',
         'PORT': '5432',
+        # Fail fast when the server is unreachable or a query hangs, so the
+        # circuit breaker (see DB_BREAKER_*) sees an error instead of workers
+        # blocking. Migrations that rewrite large tables may need a settings
+        # module with a longer statement_timeout.
+        'OPTIONS': {
+            'connect_timeout': 5,
+            'options': '-c statement_timeout=5000',
+        },
     }
 }
 
@@ -134,6 +144,122 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are stored under content-hashed names so their URLs can be cached forever
+STORAGES = {
+    'default': {
+        'BACKEND': 'users.storage.HashedMediaStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# How /api/media/ hands over file bytes:
+#   'python'           - stream from the worker (supports Range requests)
+#   'x-accel-redirect' - nginx serves MEDIA_ACCEL_REDIRECT_PREFIX + path from an
+#                        internal location aliased to MEDIA_ROOT
+#   'x-sendfile'       - Apache/lighttpd mod_xsendfile serves the absolute path
+MEDIA_DELIVERY = 'python'
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+# Cache lifetime for legacy uploads whose names carry no content hash
+MEDIA_CACHE_MAX_AGE = 3600
+# Lifetime of image URLs of pending submissions (cached privately); keep it
+# above ITEM_CACHE_TIMEOUT, which caches responses containing these URLs
+MEDIA_PRIVATE_URL_MAX_AGE = 3600
+
+# Cache
+# The local-memory cache is per process; use a shared backend (Redis or
+# Memcached) in production so feed invalidation reaches every worker.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Rendered /api/active-info/ pages are cached (with their compressed
+# variants) for this many seconds, or until information changes
+FEED_CACHE_TIMEOUT = 300
+
+# /api/my-submissions/ page size (?page_size= can ask for up to the maximum)
+MY_SUBMISSIONS_PAGE_SIZE = 20
+MY_SUBMISSIONS_MAX_PAGE_SIZE = 100
+
+# By-id endpoints (/api/active-info/by-ids/, /api/my-submissions/pending/by-ids/):
+# maximum ids per request, and how long serialized items stay cached
+INFO_MULTI_GET_MAX = 100
+ITEM_CACHE_TIMEOUT = 300
+
+# Response compression (users.middleware.CompressionMiddleware)
+# Encodings are tried in this order; br and zstd need the optional
+# `brotli` and `zstandard` packages
+RESPONSE_COMPRESSION_ENCODINGS = ['zstd', 'br', 'gzip']
+RESPONSE_COMPRESSION_MIN_SIZE = 1024
+
+# Batch endpoint (/api/batch/): maximum sub-requests per call and threads
+# used for read-only sub-requests. Reads only run on those threads when
+# database connections are reused (CONN_MAX_AGE or the psycopg `pool`
+# option); each thread then keeps one connection, so allow for
+# BATCH_MAX_WORKERS extra connections per process in max_connections.
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = 4
+
+# On-demand request profiling (users.middleware.ProfilingMiddleware)
+# Requests are profiled when they send `X-Profile: <PROFILING_TOKEN>` or are
+# sampled at PROFILING_SAMPLE_RATE (0.0-1.0). Disabled, it adds no overhead.
+PROFILING_ENABLED = False
+PROFILING_TOKEN = ''
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_MODE = 'cprofile'  # or 'sample' for collapsed stacks (flamegraphs)
+PROFILING_SAMPLE_INTERVAL = 0.001
+PROFILING_DIR = BASE_DIR / 'profiles'
+PROFILING_KEEP = 200
+
+# Degraded mode for read endpoints (users.resilience)
+# Database errors (a query hitting the statement_timeout above included) and
+# queries slower than DB_BREAKER_SLOW_QUERY_SECONDS are failures. The breaker
+# opens when the last DB_BREAKER_WINDOW_SECONDS hold at least
+# DB_BREAKER_FAILURE_THRESHOLD failures that are at least DB_BREAKER_FAILURE_RATIO
+# of all queries. While open, the feed, by-id, pending and statistics
+# endpoints answer from the last good response for the same URL (at most
+# STALE_RESPONSE_MAX_AGE seconds old, flagged with `X-Stale: 1`), checking
+# credentials against users who authenticated in the last
+# CREDENTIAL_CACHE_TTL seconds. A password change or lost approval is not
+# seen by that check until the entry expires; a shorter TTL narrows that
+# window but turns more users away with 503 during an outage. The database
+# is probed in the background every DB_BREAKER_RESET_SECONDS until it recovers.
+DB_BREAKER_FAILURE_THRESHOLD = 5
+DB_BREAKER_FAILURE_RATIO = 0.25
+DB_BREAKER_WINDOW_SECONDS = 30
+DB_BREAKER_SLOW_QUERY_SECONDS = 2.0
+DB_BREAKER_RESET_SECONDS = 10
+STALE_RESPONSE_MAX_ENTRIES = 500
+STALE_RESPONSE_MAX_AGE = 6 * 60 * 60
+CREDENTIAL_CACHE_MAX_ENTRIES = 10000
+CREDENTIAL_CACHE_TTL = 15 * 60
+
+# Near-duplicate submissions (users.duplicates)
+# A submission whose words overlap an item from the last
+# INFO_DUPLICATE_WINDOW_DAYS with an estimated Jaccard similarity of at least
+# INFO_DUPLICATE_MIN_SIMILARITY is a duplicate (a one-word edit of a 13-word
+# story is about 0.85; unrelated stories rarely reach 0.3).
+# 'flag' stores it with duplicate_of_* set for moderators; 'merge' also folds
+# resubmissions of the submitter's own pending item (and copies of published
+# items) into the existing row instead of queueing a new one; 'off' disables it.
+INFO_DUPLICATE_POLICY = 'flag'
+INFO_DUPLICATE_MIN_SIMILARITY = 0.7
+INFO_DUPLICATE_WINDOW_DAYS = 30
+INFO_DUPLICATE_REFRESH_SECONDS = 5
+
+# Retention policy for information tables (used by `manage.py archive_info`)
+# Rows older than the given number of days are moved to the archive tables
+# and their media files deleted. Processed submissions age from their
+# approval/rejection (PendingInfo.decided_at), active information from
+# approved_at. Set a value to None to keep rows forever.
+PENDING_INFO_REJECTED_RETENTION_DAYS = 30
+PENDING_INFO_APPROVED_RETENTION_DAYS = 7
+ACTIVE_INFO_RETENTION_DAYS = 365
+ARCHIVE_BATCH_SIZE = 500
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
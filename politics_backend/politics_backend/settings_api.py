@@ -0,0 +1,42 @@
+"""
+API-only settings profile for politics_backend.
+
+Select it with DJANGO_SETTINGS_MODULE=politics_backend.settings_api. The JSON
+API authenticates with email/password headers and body fields, so the admin,
+sessions, messages, templates and the middleware backing them are dropped.
+This keeps the admin's autodiscovery and the browsable API renderer out of
+worker boot and skips their work on every request.
+
+Run `python benchmarks/bench_settings_profiles.py` to compare this profile
+with the full one.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+)]
+
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in (
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+)]
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    # JSON only: the browsable API needs templates, sessions and CSRF
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+    ],
+    # Views verify credentials themselves; skip DRF's session/basic auth
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+}
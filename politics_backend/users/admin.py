@@ -1,3 +1,179 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.auth.forms import BaseUserCreationForm
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
 
-# Register your models here.
+from . import counters, duplicates, feed_cache, item_cache
+from .models import User, PendingInfo, ActiveInfo
+
+
+class CounterPaginator(Paginator):
+    """Paginator that reads unfiltered totals from the maintained counters instead of COUNT(*)"""
+
+    def __init__(self, *args, counter_names=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counter_names = counter_names
+
+    @cached_property
+    def count(self):
+        if self.counter_names and not self.object_list.query.where:
+            stats = counters.snapshot()
+            return sum(stats[name] for name in self.counter_names)
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist settings for tables with millions of rows.
+
+    Unfiltered page counts come from the counters named in `count_counters`;
+    filtered ones run a single COUNT on an indexed filter. The extra
+    "N total" count Django normally runs next to a filtered result is skipped.
+    """
+    count_counters = ()
+    show_full_result_count = False
+    list_per_page = 50
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return CounterPaginator(queryset, per_page, orphans, allow_empty_first_page,
+                                counter_names=self.count_counters)
+
+
+class UserCreationForm(BaseUserCreationForm):
+    """Admin add form: email login plus a password set through set_password()"""
+
+    class Meta(BaseUserCreationForm.Meta):
+        model = User
+        fields = ['email', 'fullname', 'role']
+
+
+@admin.register(User)
+class UserAdmin(LargeTableAdmin):
+    count_counters = (counters.USERS_TOTAL,)
+    list_display = ['id', 'email', 'fullname', 'role', 'is_approved', 'is_user', 'is_superuser', 'created_at']
+    # "No" (pending) and "Yes" (superusers) are counted through partial
+    # indexes; the other choice matches most of the table and is a full count
+    list_filter = ['is_approved', 'is_superuser']
+    # Exact match keeps the lookup on the unique email index
+    search_fields = ['=email']
+    ordering = ['-id']
+    fields = ['email', 'fullname', 'role', 'is_approved', 'approval_date', 'is_user',
+              'is_active', 'is_staff', 'is_superuser', 'last_login', 'created_at']
+    readonly_fields = ['approval_date', 'last_login', 'created_at']
+    add_form = UserCreationForm
+    add_fields = ['email', 'fullname', 'role', 'password1', 'password2', 'is_approved', 'is_user',
+                  'is_staff', 'is_superuser']
+    actions = ['approve_users']
+
+    def get_form(self, request, obj=None, **kwargs):
+        if obj is None:
+            kwargs['form'] = self.add_form
+        return super().get_form(request, obj, **kwargs)
+
+    def get_fields(self, request, obj=None):
+        return self.add_fields if obj is None else self.fields
+
+    def get_readonly_fields(self, request, obj=None):
+        return [] if obj is None else self.readonly_fields
+
+    def save_model(self, request, obj, form, change):
+        # New users are counted by the post_save receiver; edits move the
+        # user between the approval/role counters here
+        if not change:
+            super().save_model(request, obj, form, change)
+            return
+        with transaction.atomic():
+            old = User.objects.select_for_update().get(pk=obj.pk)
+            if obj.is_approved and not old.is_approved and not obj.approval_date:
+                obj.approval_date = timezone.now()
+            super().save_model(request, obj, form, change)
+            deltas = counters.user_deltas(obj)
+            for name, delta in counters.user_deltas(old, sign=-1).items():
+                deltas[name] = deltas.get(name, 0) + delta
+            counters.adjust(deltas)
+
+    @admin.action(description='Approve selected users')
+    def approve_users(self, request, queryset):
+        if not request.user.can_approve_users():
+            self.message_user(request, 'Only superusers can approve users.', messages.ERROR)
+            return
+        with transaction.atomic():
+            approved = queryset.filter(is_approved=False).update(is_approved=True, approval_date=timezone.now())
+            counters.adjust({counters.USERS_PENDING: -approved, counters.USERS_APPROVED: approved})
+            transaction.on_commit(feed_cache.bump_version)
+            transaction.on_commit(item_cache.bump_users_version)
+        self.message_user(request, f'{approved} users approved.', messages.SUCCESS)
+
+
+@admin.register(PendingInfo)
+class PendingInfoAdmin(LargeTableAdmin):
+    count_counters = (counters.PENDING_INFO_PENDING, counters.PENDING_INFO_APPROVED, counters.PENDING_INFO_REJECTED)
+    list_display = ['id', 'heading', 'submitted_by', 'status', 'submitted_at']
+    list_select_related = ['submitted_by']
+    list_filter = ['status']
+    raw_id_fields = ['submitted_by', 'duplicate_of_pending', 'duplicate_of_active']
+    # Decisions go through the actions (or PendingInfo.approve/reject), which
+    # create the ActiveInfo row and move the status counters
+    readonly_fields = ['status', 'decided_at']
+    ordering = ['-id']
+    actions = ['approve_selected', 'reject_selected']
+
+    @admin.action(description='Approve selected pending information')
+    def approve_selected(self, request, queryset):
+        if not request.user.can_approve_users():
+            self.message_user(request, 'Only superusers can approve information.', messages.ERROR)
+            return
+        now = timezone.now()
+        with transaction.atomic():
+            # One SELECT, one multi-row INSERT and one UPDATE for the whole selection
+            rows = list(queryset.filter(status='pending').select_for_update().only(
+                'id', 'heading', 'description', 'image', 'submitted_by_id'
+            ))
+            ActiveInfo.objects.bulk_create([
+                ActiveInfo(
+                    heading=row.heading,
+                    description=row.description,
+                    image=row.published_image(),
+                    submitted_by_id=row.submitted_by_id,
+                    approved_by=request.user,
+                    approved_at=now,
+                    # bulk_create skips ActiveInfo.save(), which normally sets this
+                    fingerprint=duplicates.fingerprint(row.heading, row.description),
+                )
+                for row in rows
+            ])
+            ids = [row.id for row in rows]
+            approved = PendingInfo.objects.filter(id__in=ids).update(status='approved', decided_at=now)
+            counters.adjust({
+                counters.PENDING_INFO_PENDING: -approved,
+                counters.PENDING_INFO_APPROVED: approved,
+                counters.ACTIVE_INFO_TOTAL: len(rows),
+            })
+            transaction.on_commit(feed_cache.bump_version)
+            # update() skips the receivers that drop cached items
+            transaction.on_commit(lambda: item_cache.invalidate(item_cache.PENDING, ids))
+        self.message_user(request, f'{approved} submissions approved.', messages.SUCCESS)
+
+    @admin.action(description='Reject selected pending information')
+    def reject_selected(self, request, queryset):
+        if not request.user.can_approve_users():
+            self.message_user(request, 'Only superusers can reject information.', messages.ERROR)
+            return
+        with transaction.atomic():
+            ids = list(queryset.filter(status='pending').select_for_update().values_list('id', flat=True))
+            rejected = PendingInfo.objects.filter(id__in=ids).update(status='rejected', decided_at=timezone.now())
+            counters.adjust({counters.PENDING_INFO_PENDING: -rejected, counters.PENDING_INFO_REJECTED: rejected})
+            transaction.on_commit(lambda: item_cache.invalidate(item_cache.PENDING, ids))
+        self.message_user(request, f'{rejected} submissions rejected.', messages.SUCCESS)
+
+
+@admin.register(ActiveInfo)
+class ActiveInfoAdmin(LargeTableAdmin):
+    count_counters = (counters.ACTIVE_INFO_TOTAL,)
+    list_display = ['id', 'heading', 'submitted_by', 'approved_by', 'approved_at']
+    list_select_related = ['submitted_by', 'approved_by']
+    list_filter = ['approved_at']
+    raw_id_fields = ['submitted_by', 'approved_by']
+    ordering = ['-approved_at']
@@ -0,0 +1,29 @@
+"""
+Building blocks shared by the response caches.
+
+A Namespace is a version number kept in the shared cache and made part of
+every key in the namespace, so bumping it retires all of them at once
+(feed pages, cached items, duplicate indexes). normalized_query() gives
+equivalent query strings one key.
+"""
+
+from django.core.cache import cache
+
+
+class Namespace:
+    def __init__(self, version_key):
+        self.version_key = version_key
+
+    def version(self):
+        return cache.get_or_set(self.version_key, 1, None)
+
+    def bump(self):
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, 1, None)
+
+
+def normalized_query(request):
+    """The request's query string with its parameters sorted"""
+    return '&'.join(sorted(request.GET.urlencode().split('&')))
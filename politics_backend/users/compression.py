@@ -0,0 +1,73 @@
+"""
+Response body codecs and Accept-Encoding negotiation.
+
+gzip is always available; brotli (`brotli` package) and zstd (`zstandard`
+package) are used when installed. Kept free of Django imports so the
+benchmarks can use the exact same codec configuration.
+"""
+
+import gzip
+
+CODECS = {
+    'gzip': lambda data: gzip.compress(data, compresslevel=6, mtime=0),
+}
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+else:
+    CODECS['br'] = lambda data: brotli.compress(data, quality=5)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+else:
+    _zstd = zstandard.ZstdCompressor(level=3)
+    CODECS['zstd'] = lambda data: _zstd.compress(data)
+
+
+def parse_accept_encoding(header):
+    """Return {coding: q} from an Accept-Encoding header"""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(header, preference):
+    """
+    Pick the content coding for a response.
+
+    Highest client q-value wins; ties go to the server `preference` order.
+    Returns None when no available coding is acceptable.
+    """
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    best = None
+    best_q = 0.0
+    for coding in preference:
+        if coding not in CODECS:
+            continue
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(coding, data):
+    return CODECS[coding](data)
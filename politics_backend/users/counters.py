@@ -0,0 +1,116 @@
+"""
+Maintained counters for dashboard statistics.
+
+Totals are kept in the Counter table and adjusted in the same transaction
+as the change they describe, so reading statistics never scans the user or
+information tables. Single-row creates and deletes are tracked by the
+receivers in users.signals; state changes (approval, rejection) and bulk
+writes adjust counters explicitly. `manage.py reconcile_counters` rebuilds
+every value from the source tables to fix any drift.
+"""
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+USERS_TOTAL = 'users_total'
+USERS_PENDING = 'users_pending'
+USERS_APPROVED = 'users_approved'
+USERS_IS_USER = 'users_is_user'
+USERS_SUPERUSER = 'users_superuser'
+TOKENS_TOTAL = 'tokens_total'
+PENDING_INFO_PENDING = 'pending_info_pending'
+PENDING_INFO_APPROVED = 'pending_info_approved'
+PENDING_INFO_REJECTED = 'pending_info_rejected'
+ACTIVE_INFO_TOTAL = 'active_info_total'
+
+ALL_COUNTERS = [
+    USERS_TOTAL, USERS_PENDING, USERS_APPROVED, USERS_IS_USER, USERS_SUPERUSER, TOKENS_TOTAL,
+    PENDING_INFO_PENDING, PENDING_INFO_APPROVED, PENDING_INFO_REJECTED, ACTIVE_INFO_TOTAL,
+]
+
+PENDING_INFO_STATUS_COUNTERS = {
+    'pending': PENDING_INFO_PENDING,
+    'approved': PENDING_INFO_APPROVED,
+    'rejected': PENDING_INFO_REJECTED,
+}
+
+
+def user_deltas(user, sign=1):
+    """Counter deltas contributed by a single user row"""
+    deltas = {
+        USERS_TOTAL: sign,
+        USERS_APPROVED if user.is_approved else USERS_PENDING: sign,
+    }
+    if user.is_user:
+        deltas[USERS_IS_USER] = sign
+    if user.is_superuser:
+        deltas[USERS_SUPERUSER] = sign
+    return deltas
+
+
+def adjust(deltas):
+    """Apply {counter name: delta} atomically with the caller's transaction"""
+    Counter = apps.get_model('users', 'Counter')
+    with transaction.atomic():
+        # Lock counter rows in one global order so concurrent adjustments
+        # (an API approval and a bulk admin approval) cannot deadlock
+        for name, delta in sorted(deltas.items()):
+            if not delta:
+                continue
+            if not Counter.objects.filter(name=name).update(value=F('value') + delta):
+                Counter.objects.get_or_create(name=name)
+                Counter.objects.filter(name=name).update(value=F('value') + delta)
+
+
+def snapshot():
+    """Return all counters as a dict with a single indexed read"""
+    Counter = apps.get_model('users', 'Counter')
+    values = dict.fromkeys(ALL_COUNTERS, 0)
+    values.update(Counter.objects.filter(name__in=ALL_COUNTERS).values_list('name', 'value'))
+    return values
+
+
+def compute():
+    """Count every statistic from the source tables (one aggregate per table)"""
+    User = apps.get_model('users', 'User')
+    PendingInfo = apps.get_model('users', 'PendingInfo')
+    ActiveInfo = apps.get_model('users', 'ActiveInfo')
+
+    values = dict.fromkeys(ALL_COUNTERS, 0)
+    user_counts = User.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(is_approved=False)),
+        approved=Count('id', filter=Q(is_approved=True)),
+        is_user=Count('id', filter=Q(is_user=True)),
+        superuser=Count('id', filter=Q(is_superuser=True)),
+    )
+    values[USERS_TOTAL] = user_counts['total']
+    values[USERS_PENDING] = user_counts['pending']
+    values[USERS_APPROVED] = user_counts['approved']
+    values[USERS_IS_USER] = user_counts['is_user']
+    values[USERS_SUPERUSER] = user_counts['superuser']
+
+    for status, count in PendingInfo.objects.values_list('status').annotate(count=Count('id')).order_by():
+        if status in PENDING_INFO_STATUS_COUNTERS:
+            values[PENDING_INFO_STATUS_COUNTERS[status]] = count
+    values[ACTIVE_INFO_TOTAL] = ActiveInfo.objects.count()
+
+    if apps.is_installed('rest_framework.authtoken'):
+        values[TOKENS_TOTAL] = apps.get_model('authtoken', 'Token').objects.count()
+    return values
+
+
+def reconcile():
+    """Overwrite stored counters with freshly computed values; return {name: (old, new)} for drifted ones"""
+    Counter = apps.get_model('users', 'Counter')
+    with transaction.atomic():
+        # Lock the counter rows so concurrent adjustments wait for the rewrite
+        stored = dict(Counter.objects.select_for_update().values_list('name', 'value'))
+        actual = compute()
+        drift = {}
+        for name, value in actual.items():
+            if stored.get(name) != value:
+                drift[name] = (stored.get(name), value)
+                Counter.objects.update_or_create(name=name, defaults={'value': value})
+    return drift
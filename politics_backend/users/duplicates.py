@@ -0,0 +1,206 @@
+"""
+Near-duplicate detection for submitted information.
+
+Every PendingInfo/ActiveInfo row stores a MinHash signature of the words of
+its heading and description (`fingerprint`, PERMUTATIONS 32-bit minima).
+The share of positions two signatures agree on estimates the Jaccard
+similarity of their word sets, so changing one word of a 13-word story
+still leaves about 0.85 of the signature equal.
+
+Each process keeps an in-memory LSH index of recent signatures: they are
+cut into BANDS bands of ROWS values, and items sharing any whole band are
+compared in full. With 16 bands of 4 rows, pairs at similarity 0.7 become
+candidates about 99% of the time, unrelated texts almost never. A
+lookup is BANDS dict probes plus a few signature comparisons.
+
+The index is built lazily from the last INFO_DUPLICATE_WINDOW_DAYS of rows
+and picks up rows written by other workers every INFO_DUPLICATE_REFRESH_SECONDS
+(an id > last-seen query per table). Migration 0010 computes the signatures
+of existing rows inside the window. POST /api/duplicates/rebuild/ backfills
+rows written around the models and bumps a version in the shared cache;
+every worker notices it on its next refresh and rebuilds, so those
+signatures reach all indexes.
+"""
+
+import hashlib
+import re
+import struct
+import threading
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.utils import timezone
+
+from .cache_keys import Namespace
+
+PERMUTATIONS = 64
+BANDS = 16
+ROWS = PERMUTATIONS // BANDS
+SIGNATURE = struct.Struct(f'<{PERMUTATIONS}I')
+
+WORD_RE = re.compile(r'\w+')
+
+PENDING = 'pending'
+ACTIVE = 'active'
+
+VERSION_KEY = 'duplicates:version'
+
+
+def minhash(heading, description):
+    """Tuple of PERMUTATIONS minimum 32-bit hashes over the distinct words of heading + description"""
+    # Single words rather than longer shingles: submissions are a few dozen
+    # words, and one edited word would change several overlapping shingles
+    words = set(WORD_RE.findall(f'{heading} {description}'.lower())) or {''}
+    # One SHAKE call yields all PERMUTATIONS hash values of a word
+    hashes = [SIGNATURE.unpack(hashlib.shake_128(word.encode()).digest(SIGNATURE.size)) for word in words]
+    return tuple(map(min, zip(*hashes)))
+
+
+def fingerprint(heading, description):
+    """Signature bytes as stored on the models"""
+    return SIGNATURE.pack(*minhash(heading, description))
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / PERMUTATIONS
+
+
+# Bumping it makes every worker rebuild its index on its next refresh
+namespace = Namespace(VERSION_KEY)
+version = namespace.version
+bump_version = namespace.bump
+
+
+def _bands(signature):
+    return [signature[band * ROWS:(band + 1) * ROWS] for band in range(BANDS)]
+
+
+class DuplicateIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        self._version = None
+        self.clear()
+
+    def clear(self):
+        self._bands = [{} for _ in range(BANDS)]
+        self._entries = {}  # (kind, id) -> (signature tuple, timestamp)
+        self._last_ids = {PENDING: 0, ACTIVE: 0}
+        self._refreshed_at = 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _add(self, kind, row_id, signature, timestamp):
+        key = (kind, row_id)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (signature, timestamp)
+        for band, value in enumerate(_bands(signature)):
+            self._bands[band].setdefault(value, set()).add(key)
+        self._last_ids[kind] = max(self._last_ids[kind], row_id)
+
+    def _remove(self, key):
+        signature, _ = self._entries.pop(key)
+        for band, value in enumerate(_bands(signature)):
+            bucket = self._bands[band].get(value)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._bands[band][value]
+
+    def add(self, kind, row_id, fingerprint, timestamp=None):
+        with self._lock:
+            self._add(kind, row_id, SIGNATURE.unpack(fingerprint), timestamp or timezone.now())
+
+    def discard(self, kind, row_id):
+        with self._lock:
+            if (kind, row_id) in self._entries:
+                self._remove((kind, row_id))
+
+    def _load(self, since, pending_after=0, active_after=0):
+        PendingInfo = apps.get_model('users', 'PendingInfo')
+        ActiveInfo = apps.get_model('users', 'ActiveInfo')
+        pending = PendingInfo.objects.filter(
+            id__gt=pending_after, submitted_at__gte=since, fingerprint__isnull=False
+        ).values_list('id', 'fingerprint', 'submitted_at')
+        active = ActiveInfo.objects.filter(
+            id__gt=active_after, approved_at__gte=since, fingerprint__isnull=False
+        ).values_list('id', 'fingerprint', 'approved_at')
+        for row_id, fp, timestamp in pending.iterator():
+            self._add(PENDING, row_id, SIGNATURE.unpack(fp), timestamp)
+        for row_id, fp, timestamp in active.iterator():
+            self._add(ACTIVE, row_id, SIGNATURE.unpack(fp), timestamp)
+
+    def rebuild(self):
+        with self._lock:
+            self.clear()
+            self._version = version()
+            self._load(timezone.now() - timedelta(days=settings.INFO_DUPLICATE_WINDOW_DAYS))
+            self._built = True
+            self._refreshed_at = time.monotonic()
+        return len(self)
+
+    def refresh(self):
+        """Build on first use; afterwards pick up new rows and expire old ones periodically"""
+        if not self._built:
+            self.rebuild()
+            return
+        if time.monotonic() - self._refreshed_at < settings.INFO_DUPLICATE_REFRESH_SECONDS:
+            return
+        if version() != self._version:
+            self.rebuild()
+            return
+        with self._lock:
+            since = timezone.now() - timedelta(days=settings.INFO_DUPLICATE_WINDOW_DAYS)
+            for key in [key for key, (_, timestamp) in self._entries.items() if timestamp < since]:
+                self._remove(key)
+            self._load(since, self._last_ids[PENDING], self._last_ids[ACTIVE])
+            self._refreshed_at = time.monotonic()
+
+    def find(self, fingerprint, exclude=None):
+        """Most similar indexed (kind, id, similarity) at INFO_DUPLICATE_MIN_SIMILARITY or above, or None"""
+        self.refresh()
+        signature = SIGNATURE.unpack(fingerprint)
+        min_similarity = settings.INFO_DUPLICATE_MIN_SIMILARITY
+        best = None
+        with self._lock:
+            candidates = set()
+            for band, value in enumerate(_bands(signature)):
+                candidates |= self._bands[band].get(value, set())
+            for key in candidates:
+                if key == exclude:
+                    continue
+                score = similarity(self._entries[key][0], signature)
+                if score >= min_similarity and (best is None or score > best[2]):
+                    best = (key[0], key[1], score)
+        return best
+
+
+index = DuplicateIndex()
+
+
+def backfill_fingerprints(batch_size=500, apps=apps):
+    """
+    Compute missing fingerprints for rows inside the duplicate window; return rows updated.
+    
+    Run by migration 0010 (with its historical `apps`) and by
+    POST /api/duplicates/rebuild/.
+    """
+    since = timezone.now() - timedelta(days=settings.INFO_DUPLICATE_WINDOW_DAYS)
+    updated = 0
+    for model_name, date_field in (('PendingInfo', 'submitted_at'), ('ActiveInfo', 'approved_at')):
+        model = apps.get_model('users', model_name)
+        queryset = model.objects.filter(fingerprint__isnull=True, **{f'{date_field}__gte': since})
+        while True:
+            rows = list(queryset.only('id', 'heading', 'description')[:batch_size])
+            if not rows:
+                break
+            for row in rows:
+                row.fingerprint = fingerprint(row.heading, row.description)
+            model.objects.bulk_update(rows, ['fingerprint'])
+            updated += len(rows)
+    return updated
@@ -0,0 +1,61 @@
+"""
+Cache of rendered feed responses.
+
+The active information feed is identical for every approved user, so its
+rendered JSON is cached per query string. Entries also keep the compressed
+variants produced by CompressionMiddleware, so repeat requests skip both
+serialization and compression. Every ActiveInfo change and every edit of a
+user field the feed shows bumps a version number (see users.signals),
+which retires all cached pages at once.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .cache_keys import Namespace, normalized_query
+
+VERSION_KEY = 'feed:version'
+
+
+class CachedBody:
+    """Rendered response body plus its compressed variants, keyed by content coding"""
+
+    def __init__(self, key, content, content_type='application/json'):
+        self.key = key
+        self.content = content
+        self.content_type = content_type
+        self.encodings = {}
+
+    def add_encoding(self, coding, data):
+        self.encodings[coding] = data
+        cache.set(self.key, self, settings.FEED_CACHE_TIMEOUT)
+
+
+namespace = Namespace(VERSION_KEY)
+version = namespace.version
+bump_version = namespace.bump
+
+
+def key_for(request, name):
+    query = normalized_query(request)
+    return f'feed:{name}:v{version()}:{hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()}'
+
+
+def get(key):
+    return cache.get(key)
+
+
+def store(key, content):
+    entry = CachedBody(key, content)
+    cache.set(key, entry, settings.FEED_CACHE_TIMEOUT)
+    return entry
+
+
+def response(entry):
+    """HttpResponse for a cached body; CompressionMiddleware reuses its stored encodings"""
+    http_response = HttpResponse(entry.content, content_type=entry.content_type)
+    http_response.cache_entry = entry
+    return http_response
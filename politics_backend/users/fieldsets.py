@@ -0,0 +1,168 @@
+"""
+Sparse fieldsets and relation expansion for list endpoints.
+
+    ?fields=id,heading,image,submitted_by.fullname
+    ?expand=approved_by
+
+`fields` limits the output to the listed names; `relation.name` entries pick
+fields of a nested user and imply expanding that relation. Once a client
+passes `fields` or `expand`, relations that are not expanded are rendered as
+plain ids, so their join is skipped. Without either parameter the full
+representation is returned, as before.
+
+    ?normalized=true
+
+Normalized responses render every relation as `<relation>_id` and side-load
+each referenced user once in a `users` map (see serializers.side_load_users);
+`relation.name` entries then select the fields of the side-loaded users.
+
+The same Fieldset trims the serializer (SparseFieldsetMixin) and the SQL
+(Fieldset.apply), so unrequested columns are never loaded.
+"""
+
+from rest_framework import serializers
+
+
+class FieldsetError(ValueError):
+    """Raised for unknown field or relation names in ?fields= / ?expand="""
+
+
+def _split(value):
+    return [part.strip() for part in value.split(',') if part.strip()] if value else []
+
+
+class Fieldset:
+    def __init__(self, fields=None, nested=None, expand=None, normalized=False):
+        # fields=None keeps every field; expand=None expands every relation
+        self.fields = fields
+        self.nested = nested or {}
+        self.expand = expand
+        self.normalized = normalized
+
+    @classmethod
+    def from_request(cls, request, *serializer_classes):
+        """Parse ?fields= and ?expand= and validate them against the serializers used"""
+        raw_fields = request.query_params.get('fields')
+        raw_expand = request.query_params.get('expand')
+        normalized = request.query_params.get('normalized', '').lower() in ('1', 'true', 'yes')
+        if raw_fields is None and raw_expand is None and not normalized:
+            return cls()
+
+        fields = None
+        nested = {}
+        expand = set(_split(raw_expand))
+        if raw_fields is not None:
+            fields = set()
+            for name in _split(raw_fields):
+                relation, _, sub_field = name.partition('.')
+                fields.add(relation)
+                if sub_field:
+                    nested.setdefault(relation, set()).add(sub_field)
+                    expand.add(relation)
+            fields |= expand
+
+        fieldset = cls(fields, nested, expand, normalized)
+        fieldset.validate(*serializer_classes)
+        return fieldset
+
+    @property
+    def is_full(self):
+        return self.fields is None and self.expand is None and not self.normalized
+
+    def validate(self, *serializer_classes):
+        known = set()
+        expandable = {}
+        for serializer_class in serializer_classes:
+            known.update(serializer_class.Meta.fields)
+            expandable.update(serializer_class.expandable_fields)
+
+        unknown = sorted((self.fields or set()) - known)
+        if unknown:
+            raise FieldsetError(f'Unknown field: {unknown[0]}')
+        not_expandable = sorted((self.expand or set()) - set(expandable))
+        if not_expandable:
+            raise FieldsetError(f'Field cannot be expanded: {not_expandable[0]}')
+        for relation, sub_fields in self.nested.items():
+            unknown = sorted(sub_fields - set(expandable[relation].Meta.fields))
+            if unknown:
+                raise FieldsetError(f'Unknown field: {relation}.{unknown[0]}')
+
+    def selected(self, serializer_class):
+        """Top-level field names this fieldset keeps for a serializer"""
+        names = serializer_class.Meta.fields
+        return [name for name in names if self.fields is None or name in self.fields]
+
+    def expanded(self, serializer_class):
+        """Relations rendered as nested objects for a serializer"""
+        if self.normalized:
+            return []
+        selected = self.selected(serializer_class)
+        return [
+            name for name in serializer_class.expandable_fields
+            if name in selected and (self.expand is None or name in self.expand)
+        ]
+
+    def nested_fieldset(self, relation):
+        sub_fields = self.nested.get(relation)
+        return Fieldset(fields=set(sub_fields), expand=set()) if sub_fields else None
+
+    def user_fieldset(self):
+        """Fieldset for side-loaded users: the union of all `relation.name` selections"""
+        if not self.nested:
+            return None
+        return Fieldset(fields=set().union(*self.nested.values()), expand=set())
+
+    def apply(self, queryset, serializer_class):
+        """Restrict a queryset to the columns and joins the serialized output needs"""
+        expanded = self.expanded(serializer_class)
+        if expanded:
+            # select_related() without arguments would follow every relation
+            queryset = queryset.select_related(*expanded)
+        if self.is_full:
+            return queryset
+
+        model = queryset.model
+        concrete = {field.name for field in model._meta.concrete_fields}
+        columns = [name for name in self.selected(serializer_class) if name in concrete]
+        for relation in expanded:
+            nested_class = serializer_class.expandable_fields[relation]
+            related_model = model._meta.get_field(relation).related_model
+            related_concrete = {field.name for field in related_model._meta.concrete_fields}
+            sub_fields = self.nested.get(relation) or nested_class.Meta.fields
+            columns += [f'{relation}__{name}' for name in sub_fields if name in related_concrete]
+        return queryset.only(*columns)
+
+
+class SparseFieldsetMixin:
+    """
+    ModelSerializer mixin accepting a `fieldset` keyword argument.
+
+    `expandable_fields` maps relation names to the nested serializer used when
+    the relation is expanded; collapsed relations are rendered as ids, under
+    `<relation>_id` when the fieldset is normalized.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, fieldset=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fieldset is None or fieldset.is_full:
+            return
+
+        selected = set(fieldset.selected(type(self)))
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+
+        expanded = fieldset.expanded(type(self))
+        for relation, nested_class in self.expandable_fields.items():
+            if relation not in selected:
+                continue
+            if relation in expanded:
+                nested_fieldset = fieldset.nested_fieldset(relation)
+                if nested_fieldset is not None:
+                    self.fields[relation] = nested_class(read_only=True, fieldset=nested_fieldset)
+            elif fieldset.normalized:
+                self.fields.pop(relation)
+                self.fields[f'{relation}_id'] = serializers.PrimaryKeyRelatedField(source=relation, read_only=True)
+            else:
+                self.fields[relation] = serializers.PrimaryKeyRelatedField(read_only=True)
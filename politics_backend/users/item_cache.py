@@ -0,0 +1,49 @@
+"""
+Per-item cache of serialized information for the by-id endpoints.
+
+Entries hold the full representation of one PendingInfo or ActiveInfo
+(nested users included), so a multi-get reads all its hits with a single
+cache.get_many. Saving or deleting an item drops its own entry (see
+users.signals); edits of the user fields they show bump a version that
+is part of every key, which retires all entries embedding users at once.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache_keys import Namespace
+
+PENDING = 'pending'
+ACTIVE = 'active'
+
+USERS_VERSION_KEY = 'item:users-version'
+
+
+users_namespace = Namespace(USERS_VERSION_KEY)
+users_version = users_namespace.version
+bump_users_version = users_namespace.bump
+
+
+def key_for(kind, item_id, version):
+    return f'item:{kind}:u{version}:{item_id}'
+
+
+def get_many(kind, ids):
+    """Cached representations by id, for the ids that are cached"""
+    version = users_version()
+    keys = {key_for(kind, item_id, version): item_id for item_id in ids}
+    return {keys[key]: data for key, data in cache.get_many(keys).items()}
+
+
+def set_many(kind, items):
+    """Cache full representations, given as {id: data}"""
+    version = users_version()
+    cache.set_many(
+        {key_for(kind, item_id, version): data for item_id, data in items.items()},
+        settings.ITEM_CACHE_TIMEOUT,
+    )
+
+
+def invalidate(kind, ids):
+    version = users_version()
+    cache.delete_many([key_for(kind, item_id, version) for item_id in ids])
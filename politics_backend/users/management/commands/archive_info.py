@@ -0,0 +1,146 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from users import counters, feed_cache, item_cache
+from users.models import PendingInfo, ActiveInfo, ArchivedPendingInfo, ArchivedActiveInfo
+
+
+class Command(BaseCommand):
+    help = (
+        'Move processed PendingInfo and aged ActiveInfo rows into the archive tables '
+        'and delete their media. Runs in batches; safe to interrupt and re-run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE,
+                            help='Rows moved per transaction')
+        parser.add_argument('--only', choices=['pending', 'active'],
+                            help='Archive only one of the two tables')
+        parser.add_argument('--rejected-days', type=int, default=settings.PENDING_INFO_REJECTED_RETENTION_DAYS,
+                            help='Retention for rejected pending submissions')
+        parser.add_argument('--approved-days', type=int, default=settings.PENDING_INFO_APPROVED_RETENTION_DAYS,
+                            help='Retention for approved pending submissions')
+        parser.add_argument('--active-days', type=int, default=settings.ACTIVE_INFO_RETENTION_DAYS,
+                            help='Retention for active information')
+        parser.add_argument('--keep-media', action='store_true',
+                            help='Do not delete media files of archived rows')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many rows would be archived')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        self.batch_size = options['batch_size']
+        self.keep_media = options['keep_media']
+        self.dry_run = options['dry_run']
+        now = timezone.now()
+
+        if options['only'] != 'active':
+            for status, days in (('rejected', options['rejected_days']), ('approved', options['approved_days'])):
+                if days is None:
+                    continue
+                queryset = PendingInfo.objects.filter(status=status, decided_at__lt=now - timedelta(days=days))
+                self._run(f'{status} pending info', queryset, self._archive_pending)
+
+        if options['only'] != 'pending' and options['active_days'] is not None:
+            queryset = ActiveInfo.objects.filter(approved_at__lt=now - timedelta(days=options['active_days']))
+            self._run('active info', queryset, self._archive_active)
+
+    def _run(self, label, queryset, archive_batch):
+        if self.dry_run:
+            self.stdout.write(f'{label}: {queryset.count()} rows would be archived')
+            return
+
+        total = 0
+        while True:
+            # Every batch commits on its own, so an interrupted run simply
+            # resumes from whatever is still left in the hot table.
+            ids = list(queryset.order_by('id').values_list('id', flat=True)[:self.batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                image_names = archive_batch(ids)
+                if image_names and not self.keep_media:
+                    transaction.on_commit(lambda names=image_names: self._delete_media(names))
+            total += len(ids)
+            self.stdout.write(f'{label}: archived {total} rows')
+
+        self.stdout.write(self.style.SUCCESS(f'{label}: done, {total} rows archived'))
+
+    def _archive_pending(self, ids):
+        rows = list(PendingInfo.objects.select_for_update().filter(id__in=ids))
+        ArchivedPendingInfo.objects.bulk_create([
+            ArchivedPendingInfo(
+                original_id=row.id,
+                heading=row.heading,
+                description=row.description,
+                image_name=row.image.name if row.image else '',
+                submitted_by_id=row.submitted_by_id,
+                submitted_at=row.submitted_at,
+                status=row.status,
+                decided_at=row.decided_at,
+            )
+            for row in rows
+        ], ignore_conflicts=True)
+        ids = [row.id for row in rows]
+        self._clear_references('duplicate_of_pending', ids)
+        self._delete_rows(PendingInfo, ids)
+        statuses = Counter(row.status for row in rows)
+        counters.adjust({counters.PENDING_INFO_STATUS_COUNTERS[status]: -n for status, n in statuses.items()})
+        transaction.on_commit(lambda: item_cache.invalidate(item_cache.PENDING, ids))
+        return [row.image.name for row in rows if row.image]
+
+    def _archive_active(self, ids):
+        rows = list(ActiveInfo.objects.select_for_update().filter(id__in=ids))
+        ArchivedActiveInfo.objects.bulk_create([
+            ArchivedActiveInfo(
+                original_id=row.id,
+                heading=row.heading,
+                description=row.description,
+                image_name=row.image.name if row.image else '',
+                submitted_by_id=row.submitted_by_id,
+                approved_by_id=row.approved_by_id,
+                approved_at=row.approved_at,
+                created_at=row.created_at,
+            )
+            for row in rows
+        ], ignore_conflicts=True)
+        ids = [row.id for row in rows]
+        self._clear_references('duplicate_of_active', ids)
+        self._delete_rows(ActiveInfo, ids)
+        counters.adjust({counters.ACTIVE_INFO_TOTAL: -len(rows)})
+        transaction.on_commit(feed_cache.bump_version)
+        transaction.on_commit(lambda: item_cache.invalidate(item_cache.ACTIVE, ids))
+        return [row.image.name for row in rows if row.image]
+
+    def _clear_references(self, field, ids):
+        # What on_delete=SET_NULL would do, for submissions flagged as
+        # duplicates of the archived rows
+        referencing = list(PendingInfo.objects.filter(**{f'{field}__in': ids}).values_list('id', flat=True))
+        if referencing:
+            PendingInfo.objects.filter(id__in=referencing).update(**{field: None})
+            transaction.on_commit(lambda: item_cache.invalidate(item_cache.PENDING, referencing))
+
+    def _delete_rows(self, model, ids):
+        # A single DELETE without the per-row post_delete receivers: the
+        # callers adjust the counters and caches once for the whole batch.
+        queryset = model.objects.filter(id__in=ids)
+        queryset._raw_delete(queryset.db)
+
+    def _delete_media(self, names):
+        # Identical uploads share one content-hashed file, so a file may
+        # still be used by a row that stays in a hot table.
+        in_use = set(PendingInfo.objects.filter(image__in=names).values_list('image', flat=True))
+        in_use.update(ActiveInfo.objects.filter(image__in=names).values_list('image', flat=True))
+        for name in set(names) - in_use:
+            try:
+                default_storage.delete(name)
+            except OSError as e:
+                self.stderr.write(f'Could not delete media file {name}: {e}')
@@ -0,0 +1,215 @@
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+from users.models import User, PendingInfo, ActiveInfo
+
+# Exported columns per model; related columns are joined into the same
+# query, so no per-row lookups are needed.
+EXPORTS = {
+    'users': {
+        'queryset': lambda: User.objects.all(),
+        'fields': ['id', 'email', 'fullname', 'role', 'is_approved', 'is_user', 'is_superuser',
+                   'created_at', 'approval_date'],
+        'date_field': 'created_at',
+    },
+    'pending': {
+        'queryset': lambda: PendingInfo.objects.all(),
+        'fields': ['id', 'heading', 'description', 'image', 'status', 'submitted_at',
+                   'submitted_by_id', 'submitted_by__email'],
+        'date_field': 'submitted_at',
+    },
+    'active': {
+        'queryset': lambda: ActiveInfo.objects.all(),
+        'fields': ['id', 'heading', 'description', 'image', 'approved_at', 'created_at',
+                   'submitted_by_id', 'submitted_by__email', 'approved_by_id', 'approved_by__email'],
+        'date_field': 'approved_at',
+    },
+}
+
+
+def _parse_when(value):
+    when = parse_datetime(value)
+    if when is None:
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f'Invalid date: {value}')
+        when = datetime(day.year, day.month, day.day)
+    return make_aware(when) if is_naive(when) else when
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class CheckpointedOutput:
+    """
+    Text output whose committed length is known at every checkpoint.
+
+    commit() flushes what has been written and returns the byte offset it
+    ends at; with gzip it also ends the current gzip member, so the file is
+    a valid multi-member gzip stream up to that offset. A resumed export
+    truncates the file back to the last committed offset before appending,
+    dropping rows written after the checkpoint and any torn gzip member.
+    """
+
+    def __init__(self, raw, compress):
+        self.raw = raw
+        self.compress = compress
+        self._open_layers()
+
+    def _open_layers(self):
+        self._gzip = gzip.GzipFile(fileobj=self.raw, mode='wb') if self.compress else None
+        self._text = io.TextIOWrapper(self._gzip or self.raw, encoding='utf-8', newline='')
+
+    def write(self, data):
+        return self._text.write(data)
+
+    def commit(self):
+        self._text.flush()
+        if self._gzip is not None:
+            # detach() keeps the wrapper from closing the raw file
+            self._text.detach()
+            self._gzip.close()
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+        offset = self.raw.tell()
+        if self._gzip is not None:
+            self._open_layers()
+        return offset
+
+    def close(self):
+        self._text.flush()
+        if self._gzip is not None:
+            self._text.detach()
+            self._gzip.close()
+            self.raw.close()
+        else:
+            self._text.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream users, pending or active information to CSV or NDJSON. '
+        'Rows are read with a server-side cursor so memory use stays constant.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(EXPORTS))
+        parser.add_argument('--format', choices=['csv', 'ndjson'], default='csv')
+        parser.add_argument('--output', default='-', help="Output file, or '-' for stdout")
+        parser.add_argument('--gzip', action='store_true', help='Gzip-compress the output')
+        parser.add_argument('--since', help='Only rows on/after this date or datetime')
+        parser.add_argument('--until', help='Only rows before this date or datetime')
+        parser.add_argument('--status', choices=['pending', 'approved', 'rejected'],
+                            help='Filter pending information by status')
+        parser.add_argument('--approved', choices=['yes', 'no'], help='Filter users by approval')
+        parser.add_argument('--submitted-by', help='Filter information by submitter email')
+        parser.add_argument('--checkpoint',
+                            help='File recording the last exported id; re-running resumes after it')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Rows fetched per cursor round trip')
+
+    def handle(self, *args, **options):
+        export = EXPORTS[options['model']]
+        queryset = self._filter(export, options)
+
+        checkpoint = options['checkpoint']
+        if checkpoint and options['output'] == '-':
+            raise CommandError('--checkpoint needs --output to resume into')
+        last_id, offset = self._read_checkpoint(checkpoint)
+        resuming = last_id is not None
+        if resuming:
+            queryset = queryset.filter(id__gt=last_id)
+
+        rows = queryset.order_by('id').values_list(*export['fields']).iterator(chunk_size=options['chunk_size'])
+        header = [field.replace('__', '_') for field in export['fields']]
+
+        stream = self._open(options['output'], options['gzip'], resume_offset=offset if resuming else None)
+        count = 0
+        try:
+            if options['format'] == 'csv':
+                writer = csv.writer(stream)
+                if not resuming:
+                    writer.writerow(header)
+                write = writer.writerow
+            else:
+                write = lambda row: stream.write(json.dumps(dict(zip(header, row)), default=_json_default) + '\n')
+
+            for row in rows:
+                write(row)
+                count += 1
+                if checkpoint and count % options['chunk_size'] == 0:
+                    self._write_checkpoint(checkpoint, row[0], stream.commit())
+            if checkpoint:
+                if count:
+                    self._write_checkpoint(checkpoint, row[0], stream.commit())
+                elif not resuming:
+                    # Record the header so a resume does not truncate it away
+                    self._write_checkpoint(checkpoint, 0, stream.commit())
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+        self.stderr.write(self.style.SUCCESS(f'Exported {count} {options["model"]} rows'))
+
+    def _filter(self, export, options):
+        queryset = export['queryset']()
+        date_field = export['date_field']
+        if options['since']:
+            queryset = queryset.filter(**{f'{date_field}__gte': _parse_when(options['since'])})
+        if options['until']:
+            queryset = queryset.filter(**{f'{date_field}__lt': _parse_when(options['until'])})
+
+        if options['model'] == 'users':
+            if options['status'] or options['submitted_by']:
+                raise CommandError('--status and --submitted-by do not apply to users')
+            if options['approved']:
+                queryset = queryset.filter(is_approved=options['approved'] == 'yes')
+        else:
+            if options['approved']:
+                raise CommandError('--approved only applies to users')
+            if options['status']:
+                if options['model'] != 'pending':
+                    raise CommandError('--status only applies to pending information')
+                queryset = queryset.filter(status=options['status'])
+            if options['submitted_by']:
+                queryset = queryset.filter(submitted_by__email=options['submitted_by'])
+        return queryset
+
+    def _open(self, path, compress, resume_offset=None):
+        if path == '-':
+            if compress:
+                return gzip.open(sys.stdout.buffer, 'wt', newline='', encoding='utf-8')
+            return sys.stdout
+        if resume_offset is None:
+            raw = open(path, 'wb')
+        else:
+            raw = open(path, 'r+b')
+            raw.truncate(resume_offset)
+            raw.seek(resume_offset)
+        return CheckpointedOutput(raw, compress)
+
+    def _read_checkpoint(self, path):
+        """(last exported id, committed output offset), or (None, None) without a checkpoint"""
+        if not path or not os.path.exists(path):
+            return None, None
+        with open(path) as f:
+            state = json.load(f)
+        return state['last_id'], state['offset']
+
+    def _write_checkpoint(self, path, last_id, offset):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'last_id': last_id, 'offset': offset}, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,190 @@
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from users import counters
+from users.models import User
+
+
+def _init_worker():
+    """Configure Django in hashing worker processes (spawn/forkserver start methods)"""
+    import django
+    django.setup()
+
+
+def _read_csv(stream):
+    reader = csv.DictReader(stream)
+    # Line 1 is the header row
+    for line_no, row in enumerate(reader, start=2):
+        yield line_no, row
+
+
+def _read_ndjson(stream):
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_no, e
+            continue
+        yield line_no, row
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk import users from a CSV or NDJSON file with columns '
+        'email, password, fullname and role. Passwords are hashed in a process pool.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or '-' for stdin")
+        parser.add_argument('--format', choices=['csv', 'ndjson'],
+                            help='Input format (default: guessed from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows validated, hashed and inserted per batch')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Processes used for password hashing')
+        parser.add_argument('--approve', action='store_true',
+                            help='Mark imported users as approved')
+        parser.add_argument('--error-file',
+                            help='Write rejected rows as NDJSON to this file')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+        if options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError('--batch-size and --workers must be positive')
+
+        self.approve = options['approve']
+        self.workers = options['workers']
+        self.error_file = open(options['error_file'], 'w') if options['error_file'] else None
+        self.seen_emails = set()
+        self.imported = 0
+        self.failed = 0
+
+        stream = sys.stdin if path == '-' else open(path, newline='' if fmt == 'csv' else None, encoding='utf-8')
+        rows = _read_csv(stream) if fmt == 'csv' else _read_ndjson(stream)
+        try:
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+                self.pool = pool
+                while True:
+                    batch = list(islice(rows, options['batch_size']))
+                    if not batch:
+                        break
+                    self._import_batch(batch)
+                    self.stdout.write(f'processed {self.imported + self.failed} rows: '
+                                      f'{self.imported} imported, {self.failed} failed')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            if self.error_file:
+                self.error_file.close()
+
+        self.stdout.write(self.style.SUCCESS(f'Done: {self.imported} users imported, {self.failed} rows failed'))
+
+    def _import_batch(self, batch):
+        valid = []
+        for line_no, row in batch:
+            error = self._validate(row)
+            if error:
+                self._error(line_no, row, error)
+            else:
+                valid.append((line_no, row))
+
+        # One IN query per batch instead of a uniqueness check per row
+        existing = set(User.objects.filter(
+            email__in=[row['email'] for _, row in valid]
+        ).values_list('email', flat=True))
+        fresh = []
+        for line_no, row in valid:
+            if row['email'] in existing:
+                self._error(line_no, row, 'user with this email already exists')
+            else:
+                fresh.append((line_no, row))
+        if not fresh:
+            return
+
+        chunksize = max(1, len(fresh) // (self.workers * 4))
+        hashes = self.pool.map(make_password, [row['password'] for _, row in fresh], chunksize=chunksize)
+        approval_date = timezone.now() if self.approve else None
+        users = [
+            User(
+                email=row['email'],
+                password=encoded,
+                fullname=row['fullname'],
+                role=row['role'],
+                is_approved=self.approve,
+                approval_date=approval_date,
+            )
+            for (_, row), encoded in zip(fresh, hashes)
+        ]
+
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                # bulk_create bypasses the post_save receivers
+                counters.adjust({
+                    counters.USERS_TOTAL: len(users),
+                    counters.USERS_APPROVED if self.approve else counters.USERS_PENDING: len(users),
+                })
+            self.imported += len(users)
+        except IntegrityError:
+            # Someone registered one of these emails concurrently; fall back
+            # to row-by-row inserts so only the conflicting rows fail.
+            for (line_no, row), user in zip(fresh, users):
+                try:
+                    with transaction.atomic():
+                        user.save(force_insert=True)
+                    self.imported += 1
+                except IntegrityError as e:
+                    self._error(line_no, row, str(e))
+
+    def _validate(self, row):
+        if isinstance(row, Exception):
+            return f'invalid JSON: {row}'
+        if not isinstance(row, dict):
+            return 'record must be an object'
+        for field in ('email', 'password', 'fullname', 'role'):
+            if row.get(field) is not None and not isinstance(row[field], str):
+                return f'{field} must be a string'
+
+        email = User.objects.normalize_email((row.get('email') or '').strip())
+        password = row.get('password') or ''
+        fullname = (row.get('fullname') or '').strip()
+        role = (row.get('role') or '').strip() or 'user'
+
+        try:
+            validate_email(email)
+        except ValidationError:
+            return 'invalid email'
+        if len(password) < 8:
+            return 'password must be at least 8 characters'
+        if len(fullname) > 255:
+            return 'fullname is longer than 255 characters'
+        if len(role) > 100:
+            return 'role is longer than 100 characters'
+        if email in self.seen_emails:
+            return 'duplicate email in input'
+
+        self.seen_emails.add(email)
+        row.update(email=email, fullname=fullname, role=role)
+        return None
+
+    def _error(self, line_no, row, message):
+        self.failed += 1
+        self.stderr.write(f'line {line_no}: {message}')
+        if self.error_file:
+            record = {k: v for k, v in row.items() if k != 'password'} if isinstance(row, dict) else None
+            self.error_file.write(json.dumps({'line': line_no, 'error': message, 'record': record}) + '\n')
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from users import counters
+
+
+class Command(BaseCommand):
+    help = 'Recount dashboard statistics from the source tables and fix any counter drift'
+
+    def handle(self, *args, **options):
+        drift = counters.reconcile()
+        for name, (old, new) in sorted(drift.items()):
+            self.stdout.write(f'{name}: {old} -> {new}')
+        self.stdout.write(self.style.SUCCESS(f'Counters reconciled, {len(drift)} corrected'))
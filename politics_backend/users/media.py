@@ -0,0 +1,96 @@
+"""
+Signed media URLs and byte-range support for serve_media.
+
+Image URLs in API responses point at /api/media/<signature>/<name>. They
+are only handed out to authenticated users, and the signature is checked
+without touching the database, so serving an image never re-verifies a
+password. Content-hashed names (users.storage) get far-future immutable
+caching.
+
+Images of submissions still under review (PRIVATE_PREFIXES) are the
+exception: their signature carries a timestamp, so the URL stops working
+after MEDIA_PRIVATE_URL_MAX_AGE, and they are cached privately. Approving a
+submission copies its image to ActiveInfo's upload path, where it is public.
+"""
+
+import re
+
+from django.conf import settings
+from django.core.signing import BadSignature, Signer, TimestampSigner
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Upload path of PendingInfo.image
+PRIVATE_PREFIXES = ('pending_info/',)
+
+_signer = Signer(salt='users.media')
+_private_signer = TimestampSigner(salt='users.media.private')
+
+
+def is_private(name):
+    return name.startswith(PRIVATE_PREFIXES)
+
+
+def sign(name):
+    if is_private(name):
+        # '<timestamp>:<signature>' of a TimestampSigner value
+        return _private_signer.sign(name)[len(name) + 1:]
+    return _signer.signature(name)
+
+
+def verify(name, signature):
+    if is_private(name):
+        try:
+            _private_signer.unsign(f'{name}:{signature}', max_age=settings.MEDIA_PRIVATE_URL_MAX_AGE)
+        except BadSignature:
+            return False
+        return True
+    return constant_time_compare(_signer.signature(name), signature)
+
+
+def signed_url(name):
+    return reverse('media', kwargs={'signature': sign(name), 'path': name})
+
+
+def parse_range(header, size):
+    """
+    Parse a single `bytes=start-end` Range header.
+
+    Returns (start, end) inclusive, None when the header should be ignored
+    (absent, malformed or multi-range: the full body is sent), or raises
+    ValueError when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0:
+            raise ValueError('empty suffix range')
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError('range not satisfiable')
+    return start, end
+
+
+def iter_range(file, start, end, chunk_size=64 * 1024):
+    """Yield bytes start..end (inclusive) of an open file, then close it"""
+    try:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
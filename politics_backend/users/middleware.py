@@ -0,0 +1,110 @@
+import random
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from django.utils.crypto import constant_time_compare
+
+from . import compression
+from .profiling import RequestProfiler
+
+# Only the API's JSON: HTML pages (the admin) carry CSRF tokens next to
+# reflected input, which compression would expose to BREACH
+COMPRESSIBLE_TYPES = ('application/json',)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best encoding the client accepts (zstd, br, gzip).
+
+    Bodies below RESPONSE_COMPRESSION_MIN_SIZE are sent as-is. Responses
+    built from a feed_cache entry reuse the compressed bytes stored on the
+    entry, and store newly compressed ones there for later requests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = settings.RESPONSE_COMPRESSION_MIN_SIZE
+        self.preference = settings.RESPONSE_COMPRESSION_ENCODINGS
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < self.min_size:
+            return response
+
+        coding = compression.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), self.preference)
+        if coding is None:
+            return response
+
+        entry = getattr(response, 'cache_entry', None)
+        if entry is not None and coding in entry.encodings:
+            compressed = entry.encodings[coding]
+        else:
+            compressed = compression.compress(coding, response.content)
+            if entry is not None:
+                entry.add_encoding(coding, compressed)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = coding
+        # The body differs from the uncompressed one, so a strong ETag no longer matches
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profile individual views on demand (see users.profiling).
+
+    A request is profiled when it carries `X-Profile: <PROFILING_TOKEN>` or
+    is picked by PROFILING_SAMPLE_RATE. The view and its response rendering
+    run under the profiler; the saved profile's name is returned in the
+    X-Profile-Id header. With PROFILING_ENABLED off the middleware removes
+    itself at startup, so it costs nothing per request.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.token = settings.PROFILING_TOKEN
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def _wants_profile(self, request):
+        header = request.headers.get('X-Profile')
+        if header and self.token and constant_time_compare(header, self.token):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self._wants_profile(request):
+            return None
+
+        profiler = RequestProfiler(settings.PROFILING_MODE)
+        try:
+            profiler.start()
+        except ValueError:
+            # A concurrent request already holds the process-wide profiler
+            return None
+        try:
+            response = view_func(request, *view_args, **view_kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                response = response.render()
+        finally:
+            profiler.stop()
+        label = getattr(request.resolver_match, 'url_name', None) or getattr(view_func, '__name__', 'view')
+        response['X-Profile-Id'] = profiler.save(label)
+        return response
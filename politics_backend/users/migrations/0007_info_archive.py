@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_activeinfo_pendinginfo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedActiveInfo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('heading', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('image_name', models.CharField(blank=True, max_length=255)),
+                ('approved_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedPendingInfo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('heading', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('image_name', models.CharField(blank=True, max_length=255)),
+                ('submitted_at', models.DateTimeField()),
+                ('status', models.CharField(max_length=20)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='activeinfo',
+            index=models.Index(fields=['-approved_at'], name='activeinfo_approved_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pendinginfo',
+            index=models.Index(fields=['status', '-submitted_at'], name='pendinginfo_status_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedactiveinfo',
+            name='approved_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_approved_info', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedactiveinfo',
+            name='submitted_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_submissions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='archivedpendinginfo',
+            name='submitted_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_pending_submissions', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:34
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def seed_counters(apps, schema_editor):
+    # Token counts are filled in by `manage.py reconcile_counters`, since the
+    # authtoken tables are not guaranteed to exist at this point.
+    User = apps.get_model('users', 'User')
+    PendingInfo = apps.get_model('users', 'PendingInfo')
+    ActiveInfo = apps.get_model('users', 'ActiveInfo')
+    Counter = apps.get_model('users', 'Counter')
+
+    values = User.objects.aggregate(
+        users_total=Count('id'),
+        users_pending=Count('id', filter=Q(is_approved=False)),
+        users_approved=Count('id', filter=Q(is_approved=True)),
+        users_is_user=Count('id', filter=Q(is_user=True)),
+        users_superuser=Count('id', filter=Q(is_superuser=True)),
+    )
+    for status in ('pending', 'approved', 'rejected'):
+        values[f'pending_info_{status}'] = PendingInfo.objects.filter(status=status).count()
+    values['active_info_total'] = ActiveInfo.objects.count()
+    Counter.objects.bulk_create([Counter(name=name, value=value) for name, value in values.items()])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_info_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Counter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from users import duplicates
+
+
+def backfill_fingerprints(apps, schema_editor):
+    # Rows inside the duplicate window get their MinHash signatures now, so
+    # the index works right after deploy without POST /api/duplicates/rebuild/
+    duplicates.backfill_fingerprints(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_user_pending_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activeinfo',
+            name='fingerprint',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='pendinginfo',
+            name='duplicate_of_active',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='users.activeinfo'),
+        ),
+        migrations.AddField(
+            model_name='pendinginfo',
+            name='duplicate_of_pending',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='users.pendinginfo'),
+        ),
+        migrations.AddField(
+            model_name='pendinginfo',
+            name='fingerprint',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
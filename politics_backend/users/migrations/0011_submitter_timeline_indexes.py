@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_info_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activeinfo',
+            index=models.Index(fields=['submitted_by', '-approved_at'], name='activeinfo_submitter_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pendinginfo',
+            index=models.Index(fields=['submitted_by', '-submitted_at'], name='pendinginfo_submitter_idx'),
+        ),
+    ]
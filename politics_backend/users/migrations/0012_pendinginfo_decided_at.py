@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:07
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def stamp_processed(apps, schema_editor):
+    # The decision time of existing processed rows was never stored. Use the
+    # closest record there is, so rows are not kept a full retention period
+    # from the day of this migration: for approved rows the approval time of
+    # the ActiveInfo created from them (same submitter, heading and
+    # description), for rejected rows and approvals without a match the
+    # submission time.
+    PendingInfo = apps.get_model('users', 'PendingInfo')
+    ActiveInfo = apps.get_model('users', 'ActiveInfo')
+    published = ActiveInfo.objects.filter(
+        submitted_by=models.OuterRef('submitted_by'),
+        heading=models.OuterRef('heading'),
+        description=models.OuterRef('description'),
+        approved_at__gte=models.OuterRef('submitted_at'),
+    ).order_by('approved_at').values('approved_at')[:1]
+    processed = PendingInfo.objects.filter(decided_at__isnull=True)
+    processed.filter(status='approved').update(decided_at=Coalesce(models.Subquery(published), 'submitted_at'))
+    processed.filter(status='rejected').update(decided_at=models.F('submitted_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_submitter_timeline_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedpendinginfo',
+            name='decided_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='pendinginfo',
+            name='decided_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='pendinginfo',
+            index=models.Index(fields=['status', 'decided_at'], name='pendinginfo_decided_idx'),
+        ),
+        migrations.RunPython(stamp_processed, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,10 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
+from . import counters, duplicates
+from .storage import unhashed_basename
+
 class UserManager(BaseUserManager):
     """Custom user manager for email-based authentication"""
     def create_user(self, email, password=None, **extra_fields):
@@ -10,7 +13,9 @@ class UserManager(BaseUserManager):
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
         user.set_password(password)
-        user.save(using=self._db)
+        # Atomic so the counters adjusted by the post_save receiver commit with the row
+        with transaction.atomic(using=self._db):
+            user.save(using=self._db)
         return user
     
     def create_superuser(self, email, password=None, **extra_fields):
@@ -43,15 +48,48 @@ class User(AbstractUser):
     
     objects = UserManager()
     
+    # Fields embedded in cached feed pages and items (UserSerializer)
+    FEED_FIELDS = ('email', 'fullname', 'role', 'is_approved', 'is_user', 'is_superuser', 'approval_date')
+    
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Approval queue (pending users list, admin filter)
+            models.Index(fields=['-created_at'], condition=models.Q(is_approved=False), name='user_pending_idx'),
+            # Superuser admin filter: its count and its page (ordered by -id)
+            models.Index(fields=['-id'], condition=models.Q(is_superuser=True), name='user_superuser_idx'),
+        ]
+    
     def __str__(self):
         return self.email
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_feed_fields()
+        return instance
+    
+    def remember_feed_fields(self):
+        """Record the loaded FEED_FIELDS values that feed_fields_changed() compares against"""
+        self._feed_values = {name: self.__dict__[name] for name in self.FEED_FIELDS if name in self.__dict__}
+    
+    def feed_fields_changed(self):
+        """Whether a field shown in cached responses differs from the loaded row"""
+        loaded = getattr(self, '_feed_values', None)
+        if loaded is None:
+            return True
+        return any(name in self.__dict__ and (name not in loaded or self.__dict__[name] != loaded[name])
+                   for name in self.FEED_FIELDS)
+    
     def approve_user(self, approved_by=None):
         """Approve the user and set approval date"""
+        was_approved = self.is_approved
         self.is_approved = True
         self.approval_date = timezone.now()
         # Only superusers have admin privileges - regular approved users don't get is_user=True
-        self.save()
+        with transaction.atomic():
+            self.save()
+            if not was_approved:
+                counters.adjust({counters.USERS_PENDING: -1, counters.USERS_APPROVED: 1})
     
     def can_approve_users(self):
         """Check if user can approve other users (superuser only)"""
@@ -70,36 +108,83 @@ class PendingInfo(models.Model):
         ('approved', 'Approved'),
         ('rejected', 'Rejected')
     ], default='pending')
+    # When the submission was approved or rejected; retention runs from here
+    decided_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # MinHash signature of heading + description, see users.duplicates
+    fingerprint = models.BinaryField(null=True, blank=True, editable=False)
+    duplicate_of_pending = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True,
+                                             related_name='duplicates')
+    duplicate_of_active = models.ForeignKey('ActiveInfo', on_delete=models.SET_NULL, null=True, blank=True,
+                                            related_name='duplicates')
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', '-submitted_at'], name='pendinginfo_status_idx'),
+            models.Index(fields=['submitted_by', '-submitted_at'], name='pendinginfo_submitter_idx'),
+            # Retention scans of processed submissions (archive_info)
+            models.Index(fields=['status', 'decided_at'], name='pendinginfo_decided_idx'),
+        ]
     
     def __str__(self):
         return f"Pending: {self.heading}"
     
+    def save(self, *args, **kwargs):
+        self.fingerprint = duplicates.fingerprint(self.heading, self.description)
+        super().save(*args, **kwargs)
+    
+    def published_image(self):
+        """
+        Copy the image to ActiveInfo's upload path and return the copy's name.
+        
+        Pending images are served privately from expiring URLs (users.media);
+        the copy is what published information links to.
+        """
+        if not self.image:
+            return None
+        field = ActiveInfo._meta.get_field('image')
+        name = field.generate_filename(None, unhashed_basename(self.image.name))
+        with self.image.open('rb') as content:
+            return self.image.storage.save(name, content, max_length=field.max_length)
+    
     def approve(self, approved_by):
         """Approve this pending info and create an ActiveInfo record"""
         if not approved_by.can_approve_users():
             raise PermissionError("User does not have permission to approve information")
         
-        # Create ActiveInfo record
-        ActiveInfo.objects.create(
-            heading=self.heading,
-            description=self.description,
-            image=self.image,
-            approved_by=approved_by,
-            approved_at=timezone.now(),
-            submitted_by=self.submitted_by
-        )
-        
-        # Update status
-        self.status = 'approved'
-        self.save()
+        with transaction.atomic():
+            # Create ActiveInfo record
+            ActiveInfo.objects.create(
+                heading=self.heading,
+                description=self.description,
+                image=self.published_image(),
+                approved_by=approved_by,
+                approved_at=timezone.now(),
+                submitted_by=self.submitted_by
+            )
+            
+            # Update status
+            self._set_status('approved')
     
     def reject(self, rejected_by):
         """Reject this pending info"""
         if not rejected_by.can_approve_users():
             raise PermissionError("User does not have permission to reject information")
         
-        self.status = 'rejected'
+        with transaction.atomic():
+            self._set_status('rejected')
+    
+    def _set_status(self, new_status):
+        """Save a status change and move it between the status counters"""
+        old_status = self.status
+        self.status = new_status
+        if old_status != new_status:
+            self.decided_at = timezone.now()
         self.save()
+        if old_status != new_status:
+            counters.adjust({
+                counters.PENDING_INFO_STATUS_COUNTERS[old_status]: -1,
+                counters.PENDING_INFO_STATUS_COUNTERS[new_status]: 1,
+            })
 
 
 class ActiveInfo(models.Model):
@@ -111,6 +196,59 @@ class ActiveInfo(models.Model):
     approved_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='approved_info')
     approved_at = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # MinHash signature of heading + description, see users.duplicates
+    fingerprint = models.BinaryField(null=True, blank=True, editable=False)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['-approved_at'], name='activeinfo_approved_at_idx'),
+            models.Index(fields=['submitted_by', '-approved_at'], name='activeinfo_submitter_idx'),
+        ]
     
     def __str__(self):
         return f"Active: {self.heading}"
+    
+    def save(self, *args, **kwargs):
+        self.fingerprint = duplicates.fingerprint(self.heading, self.description)
+        super().save(*args, **kwargs)
+
+
+class ArchivedPendingInfo(models.Model):
+    """Archived copy of a processed (approved/rejected) pending submission"""
+    original_id = models.BigIntegerField(unique=True)
+    heading = models.CharField(max_length=200)
+    description = models.TextField()
+    image_name = models.CharField(max_length=255, blank=True)
+    submitted_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_pending_submissions')
+    submitted_at = models.DateTimeField()
+    status = models.CharField(max_length=20)
+    decided_at = models.DateTimeField(null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Archived pending: {self.heading}"
+
+
+class ArchivedActiveInfo(models.Model):
+    """Archived copy of an aged active information record"""
+    original_id = models.BigIntegerField(unique=True)
+    heading = models.CharField(max_length=200)
+    description = models.TextField()
+    image_name = models.CharField(max_length=255, blank=True)
+    submitted_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_submissions')
+    approved_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_approved_info')
+    approved_at = models.DateTimeField()
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Archived active: {self.heading}"
+
+
+class Counter(models.Model):
+    """Named statistic maintained alongside the rows it counts (see users.counters)"""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.name}: {self.value}"
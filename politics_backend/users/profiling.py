@@ -0,0 +1,123 @@
+"""
+Per-request profiling for ProfilingMiddleware.
+
+Two modes, chosen with PROFILING_MODE:
+    'cprofile' - deterministic cProfile, saved as .pstats (snakeviz, pstats)
+    'sample'   - a sampling thread records the request thread's stack every
+                 PROFILING_SAMPLE_INTERVAL seconds, saved as collapsed stacks
+                 (.collapsed, for flamegraph.pl or speedscope)
+
+Profiles are written to PROFILING_DIR; only the newest PROFILING_KEEP are kept.
+"""
+
+import os
+import re
+import sys
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.utils import timezone
+
+PROFILE_NAME_RE = re.compile(r'^[\w.-]+\.(pstats|collapsed)$')
+
+
+class StackSampler:
+    """Sample one thread's Python stack from a background thread"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_filename}:{code.co_name}:{frame.f_lineno}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+class RequestProfiler:
+    def __init__(self, mode):
+        self.mode = mode
+        self._profile = None
+        self._sampler = None
+
+    def start(self):
+        """Start profiling the calling thread; ValueError if another cProfile is active (Python 3.12+)"""
+        if self.mode == 'sample':
+            self._sampler = StackSampler(threading.get_ident(), settings.PROFILING_SAMPLE_INTERVAL)
+            self._sampler.start()
+        else:
+            # Imported here so workers that never profile do not load it
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        if self._sampler is not None:
+            self._sampler.stop()
+        else:
+            self._profile.disable()
+
+    def save(self, label):
+        """Write the profile to PROFILING_DIR and return its file name"""
+        os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+        label = re.sub(r'[^\w-]+', '-', label).strip('-')[:60] or 'request'
+        stamp = timezone.now().strftime('%Y%m%dT%H%M%S%f')
+        extension = 'collapsed' if self._sampler is not None else 'pstats'
+        name = f'{stamp}-{label}.{extension}'
+        path = os.path.join(settings.PROFILING_DIR, name)
+        if self._sampler is not None:
+            with open(path, 'w') as f:
+                f.write(self._sampler.collapsed())
+        else:
+            self._profile.dump_stats(path)
+        prune()
+        return name
+
+
+def list_profiles():
+    """Recent profiles, newest first"""
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return []
+    profiles = []
+    for entry in os.scandir(settings.PROFILING_DIR):
+        if entry.is_file() and PROFILE_NAME_RE.match(entry.name):
+            stat = entry.stat()
+            profiles.append({'name': entry.name, 'size': stat.st_size, 'created': stat.st_mtime})
+    profiles.sort(key=lambda profile: profile['created'], reverse=True)
+    return profiles
+
+
+def profile_path(name):
+    """Absolute path of a stored profile, or None for invalid/missing names"""
+    if not PROFILE_NAME_RE.match(name):
+        return None
+    path = os.path.join(settings.PROFILING_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def prune():
+    for profile in list_profiles()[settings.PROFILING_KEEP:]:
+        try:
+            os.remove(os.path.join(settings.PROFILING_DIR, profile['name']))
+        except OSError:
+            pass
@@ -0,0 +1,229 @@
+"""
+Degraded mode for read endpoints while the database is failing.
+
+`degradable` wraps a read view. Its database queries are timed by a
+process-wide CircuitBreaker. Database errors (including queries cancelled by
+the server's statement_timeout) and queries slower than
+DB_BREAKER_SLOW_QUERY_SECONDS count as failures; the breaker opens when the
+last DB_BREAKER_WINDOW_SECONDS hold at least DB_BREAKER_FAILURE_THRESHOLD
+failures making up at least DB_BREAKER_FAILURE_RATIO of all queries, so fast
+queries in between do not hide a slow database.
+
+While the breaker is open, wrapped views do not touch the database at all:
+they verify credentials against the password hashes of users who
+authenticated in the last CREDENTIAL_CACHE_TTL seconds (CredentialCache)
+and return the last good response for the same URL from a process-local
+StaleStore, marked with `X-Stale` and `Age` headers,
+or 503 when there is none. After DB_BREAKER_RESET_SECONDS a background
+thread probes the database; once it answers, the breaker closes and the
+next requests replace the stale bodies with fresh ones.
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password
+from django.db import DatabaseError, connections
+from django.http import HttpResponse, JsonResponse
+
+from .cache_keys import normalized_query
+
+CLOSED = 'closed'
+OPEN = 'open'
+PROBING = 'probing'
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold, failure_ratio, window_seconds, slow_seconds, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.failure_ratio = failure_ratio
+        self.window_seconds = window_seconds
+        self.slow_seconds = slow_seconds
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.opened_at = 0.0
+        # [second, successes, failures] per second of the rolling window
+        self._buckets = deque()
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """True when requests may use the database; starts a background probe when one is due"""
+        if self.state == CLOSED:
+            return True
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = PROBING
+                threading.Thread(target=self._probe, daemon=True).start()
+        return False
+
+    def _bucket(self):
+        now = int(time.monotonic())
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append([now, 0, 0])
+            while self._buckets[0][0] <= now - self.window_seconds:
+                self._buckets.popleft()
+        return self._buckets[-1]
+
+    def record_success(self):
+        with self._lock:
+            self._bucket()[1] += 1
+
+    def record_failure(self):
+        with self._lock:
+            self._bucket()[2] += 1
+            if self.state != CLOSED:
+                return
+            failures = sum(bucket[2] for bucket in self._buckets)
+            queries = sum(bucket[1] + bucket[2] for bucket in self._buckets)
+            if failures >= self.failure_threshold and failures >= self.failure_ratio * queries:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._buckets.clear()
+
+    def time_query(self, execute, sql, params, many, context):
+        """connection.execute_wrapper() hook counting slow queries as failures"""
+        start = time.monotonic()
+        result = execute(sql, params, many, context)
+        if time.monotonic() - start > self.slow_seconds:
+            self.record_failure()
+        else:
+            self.record_success()
+        return result
+
+    def _probe(self):
+        connection = connections['default']
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            healthy = True
+        except DatabaseError:
+            healthy = False
+        finally:
+            connection.close()
+        with self._lock:
+            if healthy:
+                self.state = CLOSED
+                self._buckets.clear()
+            else:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+
+class StaleStore:
+    """Last good response body per URL, least recently stored evicted first"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key, content, content_type):
+        with self._lock:
+            self._entries[key] = (content, content_type, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        return self._entries.get(key)
+
+
+class CredentialCache:
+    """
+    Password hashes of recently authenticated users, for checking credentials without the database.
+
+    Only consulted while the breaker is open. An entry is the user as of its
+    last successful login, so a password change, lost approval or demotion
+    is not seen until the entry expires: the TTL bounds that window, at the
+    cost of answering 503 to users who have not authenticated within it.
+    """
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def remember(self, user):
+        with self._lock:
+            self._entries[user.email] = (user, time.monotonic())
+            self._entries.move_to_end(user.email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def verify(self, email, password):
+        """The cached user for valid credentials, else None"""
+        entry = self._entries.get(email)
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            return None
+        user = entry[0]
+        # hashers.check_password: never rehashes, so never writes
+        return user if check_password(password, user.password) else None
+
+
+breaker = CircuitBreaker(
+    settings.DB_BREAKER_FAILURE_THRESHOLD, settings.DB_BREAKER_FAILURE_RATIO, settings.DB_BREAKER_WINDOW_SECONDS,
+    settings.DB_BREAKER_SLOW_QUERY_SECONDS, settings.DB_BREAKER_RESET_SECONDS
+)
+stale_responses = StaleStore(settings.STALE_RESPONSE_MAX_ENTRIES)
+credentials = CredentialCache(settings.CREDENTIAL_CACHE_MAX_ENTRIES, settings.CREDENTIAL_CACHE_TTL)
+
+
+def _stale_key(request):
+    return request.path + '?' + normalized_query(request)
+
+
+def _serve_stale(request, key, header_prefix, permitted):
+    email = request.headers.get(f'{header_prefix}-Email')
+    password = request.headers.get(f'{header_prefix}-Password')
+    user = credentials.verify(email, password) if email and password else None
+    if user is None or not permitted(user):
+        # Without the database, unknown and invalid credentials look the same
+        return _unavailable()
+    entry = stale_responses.get(key)
+    if entry is None or time.time() - entry[2] > settings.STALE_RESPONSE_MAX_AGE:
+        return _unavailable()
+    content, content_type, stored_at = entry
+    response = HttpResponse(content, content_type=content_type)
+    response['X-Stale'] = '1'
+    response['Age'] = str(int(time.time() - stored_at))
+    return response
+
+
+def _unavailable():
+    response = JsonResponse({'error': 'Service temporarily unavailable'}, status=503)
+    response['Retry-After'] = str(settings.DB_BREAKER_RESET_SECONDS)
+    return response
+
+
+def degradable(header_prefix, permitted):
+    """
+    Serve a read view from the stale store while the database is unavailable.
+
+    Credentials are read from the `<header_prefix>-Email`/`-Password` headers
+    and `permitted(user)` decides who may see stale data. Goes outside
+    @api_view, so the wrapped view returns a renderable response.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key = _stale_key(request)
+            if not breaker.allow():
+                return _serve_stale(request, key, header_prefix, permitted)
+            try:
+                with connections['default'].execute_wrapper(breaker.time_query):
+                    response = view(request, *args, **kwargs)
+                    if hasattr(response, 'render') and callable(response.render):
+                        response = response.render()
+            except DatabaseError:
+                breaker.record_failure()
+                return _serve_stale(request, key, header_prefix, permitted)
+            if (response.status_code == 200 and not response.streaming
+                    and response.get('Content-Type', '').startswith('application/json')):
+                stale_responses.put(key, response.content, response['Content-Type'])
+            return response
+        return wrapper
+    return decorator
@@ -1,10 +1,21 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import PendingInfo, ActiveInfo
+from .fieldsets import Fieldset, SparseFieldsetMixin
+from . import media
 
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+class SignedImageField(serializers.ImageField):
+    """Image field rendered as a signed /api/media/ URL"""
+    def to_representation(self, value):
+        if not value:
+            return None
+        url = media.signed_url(value.name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'email', 'fullname', 'role', 'is_approved', 'is_user', 'is_superuser', 'created_at', 'approval_date']
@@ -35,20 +46,48 @@ class UserApprovalSerializer(serializers.ModelSerializer):
         read_only_fields = ['is_approved']
 
 
-class PendingInfoSerializer(serializers.ModelSerializer):
+class PendingInfoSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     submitted_by = UserSerializer(read_only=True)
+    image = SignedImageField(max_length=100, required=False, allow_null=True)
+    expandable_fields = {'submitted_by': UserSerializer}
     
     class Meta:
         model = PendingInfo
-        fields = ['id', 'heading', 'description', 'image', 'submitted_by', 'submitted_at', 'status']
-        read_only_fields = ['id', 'submitted_by', 'submitted_at', 'status']
+        fields = ['id', 'heading', 'description', 'image', 'submitted_by', 'submitted_at', 'status',
+                  'duplicate_of_pending', 'duplicate_of_active']
+        read_only_fields = ['id', 'submitted_by', 'submitted_at', 'status',
+                            'duplicate_of_pending', 'duplicate_of_active']
 
 
-class ActiveInfoSerializer(serializers.ModelSerializer):
+class ActiveInfoSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     submitted_by = UserSerializer(read_only=True)
     approved_by = UserSerializer(read_only=True)
+    image = SignedImageField(max_length=100, required=False, allow_null=True)
+    expandable_fields = {'submitted_by': UserSerializer, 'approved_by': UserSerializer}
     
     class Meta:
         model = ActiveInfo
         fields = ['id', 'heading', 'description', 'image', 'submitted_by', 'approved_by', 'approved_at', 'created_at']
         read_only_fields = ['id', 'submitted_by', 'approved_by', 'approved_at', 'created_at']
+
+
+def side_load_users(fieldset, *results):
+    """
+    Build the `users` map of a normalized response.
+
+    `results` are (serializer class, serialized items) pairs; every user id
+    they reference is fetched with a single IN query and serialized once.
+    """
+    ids = set()
+    for serializer_class, items in results:
+        keys = [f'{relation}_id' for relation in serializer_class.expandable_fields
+                if relation in fieldset.selected(serializer_class)]
+        for item in items:
+            ids.update(item[key] for key in keys if item[key] is not None)
+    
+    # Without `relation.name` selections send full users, but still skip
+    # columns such as the password hash that are never serialized
+    user_fieldset = fieldset.user_fieldset() or Fieldset(fields=set(UserSerializer.Meta.fields), expand=set())
+    users = list(user_fieldset.apply(User.objects.filter(id__in=ids), UserSerializer))
+    data = UserSerializer(users, many=True, fieldset=user_fieldset).data
+    return {str(user.pk): user_data for user, user_data in zip(users, data)}
@@ -0,0 +1,100 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import counters, feed_cache, item_cache
+from .models import User, PendingInfo, ActiveInfo
+
+
+@receiver(post_save, sender=User)
+def count_created_user(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.adjust(counters.user_deltas(instance))
+
+
+@receiver(post_delete, sender=User)
+def count_deleted_user(sender, instance, **kwargs):
+    counters.adjust(counters.user_deltas(instance, sign=-1))
+
+
+@receiver(post_save, sender=PendingInfo)
+def count_created_pending_info(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.adjust({counters.PENDING_INFO_STATUS_COUNTERS[instance.status]: 1})
+
+
+@receiver(post_delete, sender=PendingInfo)
+def count_deleted_pending_info(sender, instance, **kwargs):
+    counters.adjust({counters.PENDING_INFO_STATUS_COUNTERS[instance.status]: -1})
+
+
+@receiver(post_save, sender=ActiveInfo)
+def count_created_active_info(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.adjust({counters.ACTIVE_INFO_TOTAL: 1})
+
+
+@receiver(post_delete, sender=ActiveInfo)
+def count_deleted_active_info(sender, instance, **kwargs):
+    counters.adjust({counters.ACTIVE_INFO_TOTAL: -1})
+
+
+@receiver(post_save, sender=ActiveInfo)
+@receiver(post_delete, sender=ActiveInfo)
+@receiver(post_delete, sender=User)
+def invalidate_feed_cache(sender, raw=False, **kwargs):
+    # Bumping after commit keeps a concurrent request from re-caching the old rows
+    if not raw:
+        transaction.on_commit(feed_cache.bump_version)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_caches(sender, instance, created, raw=False, **kwargs):
+    # Feed pages and cached items embed nested users. A new user is in none
+    # of them yet, and most saves (last_login, password rehash) change
+    # nothing they show, so only edits to User.FEED_FIELDS retire them.
+    changed = instance.feed_fields_changed()
+    instance.remember_feed_fields()
+    if not raw and not created and changed:
+        transaction.on_commit(feed_cache.bump_version)
+        transaction.on_commit(item_cache.bump_users_version)
+
+
+@receiver(post_save, sender=PendingInfo)
+@receiver(post_delete, sender=PendingInfo)
+def invalidate_cached_pending_info(sender, instance, raw=False, **kwargs):
+    if not raw:
+        # Read now: a delete has reset instance.pk to None by commit time
+        pk = instance.pk
+        transaction.on_commit(lambda: item_cache.invalidate(item_cache.PENDING, [pk]))
+
+
+@receiver(post_save, sender=ActiveInfo)
+@receiver(post_delete, sender=ActiveInfo)
+def invalidate_cached_active_info(sender, instance, raw=False, **kwargs):
+    if not raw:
+        # Read now: a delete has reset instance.pk to None by commit time
+        pk = instance.pk
+        transaction.on_commit(lambda: item_cache.invalidate(item_cache.ACTIVE, [pk]))
+
+
+@receiver(post_delete, sender=User)
+def invalidate_cached_items(sender, raw=False, **kwargs):
+    # Cached items embed their users
+    if not raw:
+        transaction.on_commit(item_cache.bump_users_version)
+
+
+def count_created_token(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.adjust({counters.TOKENS_TOTAL: 1})
+
+
+def count_deleted_token(sender, instance, **kwargs):
+    counters.adjust({counters.TOKENS_TOTAL: -1})
+
+
+if apps.is_installed('rest_framework.authtoken'):
+    post_save.connect(count_created_token, sender='authtoken.Token')
+    post_delete.connect(count_deleted_token, sender='authtoken.Token')
@@ -0,0 +1,56 @@
+import hashlib
+import os
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage
+
+HASH_LENGTH = 12
+
+
+class HashedMediaStorage(FileSystemStorage):
+    """
+    File storage that embeds a content hash in every saved file name.
+
+    `pending_info/photo.jpg` is stored as `pending_info/photo.<hash>.jpg`, so a
+    name never refers to different bytes and media URLs can be cached as
+    immutable. Uploading identical bytes again reuses the existing file.
+    """
+
+    def save(self, name, content, max_length=None):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+
+        root, ext = os.path.splitext(name)
+        suffix = f'.{digest.hexdigest()[:HASH_LENGTH]}{ext}'
+        if max_length and len(root) + len(suffix) > max_length:
+            # Shorten the stem here: get_available_name() would otherwise cut
+            # the hash off and add a random suffix, so the same bytes saved
+            # twice would get two names
+            directory, stem = os.path.split(root)
+            stem = stem[:max_length - len(suffix) - len(root) + len(stem)]
+            if not stem:
+                raise SuspiciousFileOperation(f'Storage can not find an available filename for "{name}".')
+            root = os.path.join(directory, stem)
+        hashed_name = root + suffix
+        if self.exists(hashed_name):
+            return hashed_name
+        return super().save(hashed_name, content, max_length=max_length)
+
+
+def is_hashed_name(name):
+    """True for names written by HashedMediaStorage (content can never change)"""
+    stem = os.path.splitext(name)[0]
+    _, _, suffix = stem.rpartition('.')
+    return len(suffix) == HASH_LENGTH and all(c in '0123456789abcdef' for c in suffix)
+
+
+def unhashed_basename(name):
+    """File name of a stored file without its directory and content hash"""
+    basename = os.path.basename(name)
+    if not is_hashed_name(basename):
+        return basename
+    stem, ext = os.path.splitext(basename)
+    return stem[:-HASH_LENGTH - 1] + ext
@@ -0,0 +1,801 @@
+import base64
+import gzip
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import Permission
+from django.db import OperationalError
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from . import counters, duplicates, feed_cache, item_cache, media, resilience, timeline, views
+from .fieldsets import Fieldset
+from .middleware import ProfilingMiddleware
+from .models import User, PendingInfo, ActiveInfo, ArchivedPendingInfo
+from .serializers import ActiveInfoSerializer
+from .storage import HashedMediaStorage, is_hashed_name
+
+HEADING = 'Flood warning for the northern districts'
+DESCRIPTION = (
+    'Heavy rains are expected across the northern districts tonight. Residents near the river '
+    'are urged to stay indoors, keep away from the banks and follow updates from the district office.'
+)
+
+
+class MinHashTests(SimpleTestCase):
+    def test_signature_is_deterministic(self):
+        self.assertEqual(duplicates.fingerprint(HEADING, DESCRIPTION), duplicates.fingerprint(HEADING, DESCRIPTION))
+        self.assertEqual(len(duplicates.minhash(HEADING, DESCRIPTION)), duplicates.PERMUTATIONS)
+
+    def test_case_and_punctuation_are_ignored(self):
+        a = duplicates.minhash(HEADING, DESCRIPTION)
+        b = duplicates.minhash(HEADING.upper(), DESCRIPTION.replace('.', '!'))
+        self.assertEqual(duplicates.similarity(a, b), 1.0)
+
+    def test_one_word_edit_of_short_text_is_similar(self):
+        a = duplicates.minhash('Flood warning', 'Heavy rains expected across the northern districts tonight, stay indoors')
+        b = duplicates.minhash('Flood warning', 'Heavy rain expected across the northern districts tonight, stay indoors')
+        self.assertGreaterEqual(duplicates.similarity(a, b), 0.7)
+
+    def test_one_word_edits_are_detected(self):
+        rng = random.Random(0)
+        vocabulary = [f'word{i}' for i in range(5000)]
+        for length in (13, 20, 50, 100):
+            detected = 0
+            for _ in range(100):
+                words = rng.sample(vocabulary, length)
+                edited = list(words)
+                edited[rng.randrange(length)] = rng.choice(vocabulary)
+                a = duplicates.minhash('', ' '.join(words))
+                b = duplicates.minhash('', ' '.join(edited))
+                detected += duplicates.similarity(a, b) >= 0.7
+            self.assertGreaterEqual(detected, 95, f'{length}-word texts')
+
+    def test_unrelated_texts_are_not_similar(self):
+        a = duplicates.minhash(HEADING, DESCRIPTION)
+        b = duplicates.minhash('Budget vote', 'The council approved the new city budget after a long debate on Monday.')
+        self.assertLess(duplicates.similarity(a, b), 0.3)
+
+
+@override_settings(INFO_DUPLICATE_MIN_SIMILARITY=0.7, INFO_DUPLICATE_WINDOW_DAYS=30,
+                   INFO_DUPLICATE_REFRESH_SECONDS=3600)
+class DuplicateIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = duplicates.DuplicateIndex()
+        # Treat the index as freshly built so lookups stay off the database
+        self.index._built = True
+        self.index._refreshed_at = time.monotonic()
+        self.index.add(duplicates.PENDING, 1, duplicates.fingerprint(HEADING, DESCRIPTION), timezone.now())
+        self.index.add(duplicates.ACTIVE, 2, duplicates.fingerprint(
+            'Budget vote', 'The council approved the new city budget after a long debate on Monday.'
+        ), timezone.now())
+
+    def test_one_word_edit_is_found(self):
+        match = self.index.find(duplicates.fingerprint(HEADING, DESCRIPTION.replace('rains', 'rain')))
+        self.assertIsNotNone(match)
+        self.assertEqual(match[:2], (duplicates.PENDING, 1))
+
+    def test_unrelated_text_is_not_found(self):
+        self.assertIsNone(self.index.find(duplicates.fingerprint(
+            'Road closure', 'The main bridge will be closed for repairs from Friday until the end of the month.'
+        )))
+
+    def test_exclude_and_discard(self):
+        fp = duplicates.fingerprint(HEADING, DESCRIPTION)
+        self.assertIsNone(self.index.find(fp, exclude=(duplicates.PENDING, 1)))
+        self.index.discard(duplicates.PENDING, 1)
+        self.assertIsNone(self.index.find(fp))
+        self.assertEqual(len(self.index), 1)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+                   INFO_DUPLICATE_POLICY='flag')
+class SubmitDuplicateTests(TestCase):
+    def setUp(self):
+        duplicates.index.clear()
+        duplicates.index._built = False
+        User.objects.create_user('first@example.com', 'password123', fullname='First', is_approved=True)
+        User.objects.create_user('second@example.com', 'password123', fullname='Second', is_approved=True)
+
+    def submit(self, email, heading, description):
+        return self.client.post('/api/submit-info/', {
+            'email': email, 'password': 'password123', 'heading': heading, 'description': description
+        }, content_type='application/json')
+
+    def test_one_word_edit_is_flagged(self):
+        original = self.submit('first@example.com', HEADING, DESCRIPTION).json()['pending_info']
+        response = self.submit('second@example.com', HEADING, DESCRIPTION.replace('tonight', 'this evening'))
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('possible duplicate', response.json()['message'])
+        self.assertEqual(response.json()['pending_info']['duplicate_of_pending'], original['id'])
+
+    def test_different_story_is_not_flagged(self):
+        self.submit('first@example.com', HEADING, DESCRIPTION)
+        response = self.submit('second@example.com', 'Budget vote',
+                               'The council approved the new city budget after a long debate on Monday.')
+        self.assertIsNone(response.json()['pending_info']['duplicate_of_pending'])
+
+    def test_rebuild_reaches_other_workers(self):
+        first = User.objects.get(email='first@example.com')
+        old = PendingInfo.objects.create(heading=HEADING, description=DESCRIPTION, submitted_by=first)
+        PendingInfo.objects.create(heading='Budget vote', description='The council approved the budget.',
+                                   submitted_by=first)
+        # A row from before fingerprints existed, older than the worker's last seen id
+        PendingInfo.objects.filter(id=old.id).update(fingerprint=None)
+        worker = duplicates.DuplicateIndex()
+        worker.rebuild()
+        
+        duplicates.backfill_fingerprints()
+        duplicates.bump_version()
+        worker._refreshed_at = 0
+        match = worker.find(duplicates.fingerprint(HEADING, DESCRIPTION))
+        self.assertEqual(match[:2], (duplicates.PENDING, old.id))
+
+    @override_settings(INFO_DUPLICATE_POLICY='merge')
+    def test_own_resubmission_is_merged(self):
+        self.submit('first@example.com', HEADING, DESCRIPTION)
+        response = self.submit('first@example.com', HEADING, DESCRIPTION.replace('rains', 'rain'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(PendingInfo.objects.count(), 1)
+        self.assertIn('rain are', PendingInfo.objects.get().description)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserAdminTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin@example.com', 'password123', fullname='Admin')
+        self.client.force_login(self.admin)
+
+    def assertCountersInSync(self):
+        self.assertEqual(counters.snapshot(), counters.compute())
+
+    def test_add_form_sets_password(self):
+        response = self.client.post('/admin/users/user/add/', {
+            'email': 'new@example.com', 'fullname': 'New', 'role': 'user',
+            'password1': 'a-long-password-1', 'password2': 'a-long-password-1',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(User.objects.get(email='new@example.com').check_password('a-long-password-1'))
+        self.assertCountersInSync()
+
+    def test_editing_flags_moves_counters(self):
+        user = User.objects.create_user('member@example.com', 'password123', fullname='Member')
+        response = self.client.post(f'/admin/users/user/{user.pk}/change/', {
+            'email': user.email, 'fullname': user.fullname, 'role': 'user',
+            'is_approved': 'on', 'is_user': 'on', 'is_active': 'on',
+        })
+        self.assertEqual(response.status_code, 302)
+        user.refresh_from_db()
+        self.assertTrue(user.is_approved)
+        self.assertIsNotNone(user.approval_date)
+        self.assertCountersInSync()
+
+    def test_approve_action_requires_superuser(self):
+        staff = User.objects.create_user('staff@example.com', 'password123', is_staff=True)
+        staff.user_permissions.add(*Permission.objects.filter(codename__in=['change_user', 'view_user']))
+        pending = User.objects.create_user('waiting@example.com', 'password123')
+        self.client.force_login(staff)
+        self.client.post('/admin/users/user/', {'action': 'approve_users', '_selected_action': [pending.pk]})
+        pending.refresh_from_db()
+        self.assertFalse(pending.is_approved)
+
+    def test_pending_info_status_is_read_only(self):
+        info = PendingInfo.objects.create(heading='Heading', description='Body', submitted_by=self.admin)
+        form = self.client.get(f'/admin/users/pendinginfo/{info.pk}/change/').context['adminform'].form
+        self.assertNotIn('status', form.fields)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ImportUsersTests(TestCase):
+    def test_non_string_values_are_row_errors(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False) as f:
+            f.write('{"email": 5, "password": "password123"}\n')
+            f.write('{"email": "typed@example.com", "password": 12345678}\n')
+            f.write('{"email": "valid@example.com", "password": "password123"}\n')
+        self.addCleanup(os.remove, f.name)
+        stderr = io.StringIO()
+        call_command('import_users', f.name, stdout=io.StringIO(), stderr=stderr)
+        self.assertIn('line 1: email must be a string', stderr.getvalue())
+        self.assertIn('line 2: password must be a string', stderr.getvalue())
+        self.assertEqual(list(User.objects.values_list('email', flat=True)), ['valid@example.com'])
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ExportDataTests(TestCase):
+    def export(self, output, checkpoint, *args):
+        call_command('export_data', 'users', '--format', 'ndjson', '--output', output,
+                     '--checkpoint', checkpoint, '--chunk-size', '2', *args, stderr=io.StringIO())
+
+    def check_resume_after_crash(self, compress):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        output, checkpoint = os.path.join(directory, 'users.ndjson'), os.path.join(directory, 'users.checkpoint')
+        args = ['--gzip'] if compress else []
+        for i in range(3):
+            User.objects.create_user(f'user{i}@example.com', 'password123')
+        self.export(output, checkpoint, *args)
+        # A crash after the checkpoint: a row and a torn gzip member past the committed offset
+        with open(output, 'ab') as f:
+            f.write(gzip.compress(b'{"id": 2}\n')[:12] if compress else b'{"id": 2}\n')
+        for i in range(3, 6):
+            User.objects.create_user(f'user{i}@example.com', 'password123')
+        self.export(output, checkpoint, *args)
+
+        with (gzip.open if compress else open)(output, 'rt') as f:
+            ids = [json.loads(line)['id'] for line in f]
+        self.assertEqual(ids, list(User.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_resume_truncates_rows_after_checkpoint(self):
+        self.check_resume_after_crash(compress=False)
+
+    def test_resume_gzip_drops_torn_member(self):
+        self.check_resume_after_crash(compress=True)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserCacheInvalidationTests(TestCase):
+    def versions(self):
+        return feed_cache.version(), item_cache.users_version()
+
+    def test_only_visible_user_edits_retire_cached_responses(self):
+        before = self.versions()
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user('member@example.com', 'password123', fullname='Member')
+        self.assertEqual(self.versions(), before)
+
+        user = User.objects.get(pk=user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.last_login = timezone.now()
+            user.set_password('another-password')
+            user.save()
+        self.assertEqual(self.versions(), before)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.fullname = 'Renamed'
+            user.save()
+        after = self.versions()
+        self.assertGreater(after[0], before[0])
+        self.assertGreater(after[1], before[1])
+
+        # The saved values become the new baseline
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        self.assertEqual(self.versions(), after)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class StatisticsTests(TestCase):
+    def setUp(self):
+        User.objects.create_superuser('admin@example.com', 'password123', fullname='Admin')
+        User.objects.create_user('member@example.com', 'password123', fullname='Member', is_approved=True)
+
+    def stats(self, email, password='password123'):
+        return self.client.get('/api/stats/', HTTP_X_ADMIN_EMAIL=email, HTTP_X_ADMIN_PASSWORD=password)
+
+    def test_superusers_get_the_counters(self):
+        response = self.stats('admin@example.com')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[counters.USERS_TOTAL], 2)
+
+    def test_header_credentials_are_checked(self):
+        self.assertEqual(self.stats('admin@example.com', 'wrong').status_code, 401)
+        response = self.stats('member@example.com')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {'error': 'Only superusers and admins can view statistics'})
+
+
+class ServeMediaTests(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        for name in ('pending_info/photo.0123456789ab.jpg', 'active_info/photo 1.0123456789ab.jpg'):
+            os.makedirs(os.path.join(self.media_root, os.path.dirname(name)), exist_ok=True)
+            with open(os.path.join(self.media_root, name), 'wb') as f:
+                f.write(b'jpeg')
+
+    def get(self, name):
+        with self.settings(MEDIA_ROOT=self.media_root, MEDIA_DELIVERY='x-accel-redirect'):
+            return self.client.get(media.signed_url(name))
+
+    def test_pending_media_is_cached_privately(self):
+        self.assertTrue(self.get('pending_info/photo.0123456789ab.jpg')['Cache-Control'].startswith('private'))
+
+    def test_accel_redirect_path_is_quoted(self):
+        response = self.get('active_info/photo 1.0123456789ab.jpg')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/active_info/photo%201.0123456789ab.jpg')
+
+    def test_published_media_is_immutable(self):
+        response = self.get('active_info/photo 1.0123456789ab.jpg')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+
+    def test_pending_media_url_expires(self):
+        with self.settings(MEDIA_PRIVATE_URL_MAX_AGE=-1):
+            self.assertEqual(self.get('pending_info/photo.0123456789ab.jpg').status_code, 404)
+
+    def test_public_signature_does_not_open_pending_media(self):
+        name = 'pending_info/photo.0123456789ab.jpg'
+        with self.settings(MEDIA_ROOT=self.media_root):
+            response = self.client.get(f'/api/media/{media._signer.signature(name)}/{name}')
+        self.assertEqual(response.status_code, 404)
+
+
+class HashedMediaStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.storage = HashedMediaStorage(location=tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.storage.location)
+
+    def test_identical_bytes_share_a_name(self):
+        first = self.storage.save('pending_info/photo.jpg', ContentFile(b'jpeg'), max_length=100)
+        self.assertEqual(self.storage.save('pending_info/photo.jpg', ContentFile(b'jpeg'), max_length=100), first)
+        self.assertTrue(is_hashed_name(first))
+
+    def test_long_names_are_shortened_before_hashing(self):
+        name = 'pending_info/' + 'x' * 120 + '.jpg'
+        first = self.storage.save(name, ContentFile(b'jpeg'), max_length=100)
+        second = self.storage.save(name, ContentFile(b'jpeg'), max_length=100)
+        self.assertEqual(first, second)
+        self.assertLessEqual(len(first), 100)
+        self.assertTrue(is_hashed_name(first))
+        self.assertEqual(len(os.listdir(os.path.join(self.storage.location, 'pending_info'))), 1)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class PublishImageTests(TestCase):
+    def test_approval_publishes_a_copy_of_the_image(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        with self.settings(MEDIA_ROOT=media_root):
+            admin = User.objects.create_superuser('admin@example.com', 'password123', fullname='Admin')
+            info = PendingInfo(heading='Heading', description='Body', submitted_by=admin)
+            info.image.save('photo.jpg', ContentFile(b'jpeg'))
+            info.approve(admin)
+            image = ActiveInfo.objects.get().image
+            self.assertTrue(image.name.startswith('active_info/photo.'))
+            self.assertTrue(is_hashed_name(image.name))
+            self.assertFalse(media.is_private(image.name))
+            with image.open('rb') as f:
+                self.assertEqual(f.read(), b'jpeg')
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ArchiveInfoTests(TestCase):
+    def test_processed_submissions_age_from_their_decision(self):
+        admin = User.objects.create_superuser('admin@example.com', 'password123', fullname='Admin')
+        old = timezone.now() - timedelta(days=60)
+        decided_long_ago = PendingInfo.objects.create(heading='A', description='First', submitted_by=admin)
+        decided_recently = PendingInfo.objects.create(heading='B', description='Second', submitted_by=admin)
+        decided_long_ago.reject(admin)
+        decided_recently.reject(admin)
+        PendingInfo.objects.filter(pk=decided_long_ago.pk).update(submitted_at=old, decided_at=old)
+        PendingInfo.objects.filter(pk=decided_recently.pk).update(submitted_at=old)
+
+        call_command('archive_info', '--only', 'pending', '--rejected-days', '30', '--keep-media', stdout=io.StringIO())
+        self.assertEqual(list(PendingInfo.objects.values_list('pk', flat=True)), [decided_recently.pk])
+        self.assertEqual(ArchivedPendingInfo.objects.get().decided_at, old)
+
+    def test_counters_are_adjusted_once_per_batch(self):
+        admin = User.objects.create_superuser('admin@example.com', 'password123', fullname='Admin')
+        old = timezone.now() - timedelta(days=400)
+        active = [ActiveInfo.objects.create(heading=f'Item {i}', description='Body', submitted_by=admin,
+                                            approved_by=admin, approved_at=old) for i in range(3)]
+        rejected = [PendingInfo.objects.create(heading=f'Rejected {i}', description='Body', submitted_by=admin)
+                    for i in range(3)]
+        PendingInfo.objects.filter(pk__in=[row.pk for row in rejected]).update(status='rejected', decided_at=old)
+        counters.adjust({counters.PENDING_INFO_PENDING: -3, counters.PENDING_INFO_REJECTED: 3})
+        flagged = PendingInfo.objects.create(heading='Copy', description='Body', submitted_by=admin,
+                                             duplicate_of_active=active[0])
+        before = counters.snapshot()
+
+        with mock.patch.object(counters, 'adjust', wraps=counters.adjust) as adjust:
+            call_command('archive_info', '--batch-size', '2', '--keep-media', stdout=io.StringIO())
+        # Two batches of each table, no per-row post_delete adjustments
+        self.assertEqual(adjust.call_count, 4)
+        after = counters.snapshot()
+        self.assertEqual(after[counters.ACTIVE_INFO_TOTAL], before[counters.ACTIVE_INFO_TOTAL] - 3)
+        self.assertEqual(after[counters.PENDING_INFO_REJECTED], before[counters.PENDING_INFO_REJECTED] - 3)
+        self.assertEqual(after, counters.compute())
+        self.assertEqual(list(PendingInfo.objects.values_list('pk', flat=True)), [flagged.pk])
+        flagged.refresh_from_db()
+        self.assertIsNone(flagged.duplicate_of_active)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BatchRequestTests(TestCase):
+    def setUp(self):
+        User.objects.create_user('member@example.com', 'password123', fullname='Member', is_approved=True)
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        with open(os.path.join(self.media_root, 'photo.jpg'), 'wb') as f:
+            f.write(b'jpeg')
+
+    def batch(self, *paths):
+        with self.settings(MEDIA_ROOT=self.media_root):
+            response = self.client.post('/api/batch/', {
+                'email': 'member@example.com', 'password': 'password123',
+                'requests': [{'method': 'GET', 'path': path} for path in paths],
+            }, content_type='application/json')
+        return response.json()['responses']
+
+    def test_streaming_responses_are_rejected(self):
+        [entry] = self.batch(media.signed_url('photo.jpg'))
+        self.assertEqual(entry['status'], 400)
+
+    def test_unexpected_errors_are_not_leaked(self):
+        with mock.patch('users.views._build_subrequest', side_effect=RuntimeError('secret detail')), \
+                self.assertLogs('users.views', 'ERROR'):
+            [entry] = self.batch('/api/profile/')
+        self.assertEqual(entry, {'status': 500, 'body': {'error': 'Internal server error'}})
+
+    def test_reads_share_the_request_connection_without_connection_reuse(self):
+        threads = []
+        dispatch = views._dispatch_subrequest
+
+        def record_thread(*args):
+            threads.append(threading.current_thread())
+            return dispatch(*args)
+
+        with mock.patch('users.views._dispatch_subrequest', side_effect=record_thread):
+            responses = self.batch('/api/profile/', '/api/active-info/', '/api/profile/')
+        self.assertEqual([entry['status'] for entry in responses], [200, 200, 200])
+        self.assertEqual(threads, [threading.current_thread()] * 3)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'], BATCH_MAX_WORKERS=3)
+class ParallelBatchReadsTests(TransactionTestCase):
+    # Worker threads use their own connections, so the data has to be committed
+
+    def setUp(self):
+        User.objects.create_user('member@example.com', 'password123', fullname='Member', is_approved=True)
+        views._read_executor.cache_clear()
+        self.addCleanup(views._read_executor.cache_clear)
+        self.addCleanup(lambda: views._read_executor().shutdown())
+
+    def test_reads_run_on_worker_threads_in_request_order(self):
+        threads = []
+        dispatch = views._dispatch_subrequest
+
+        def record_thread(*args):
+            threads.append(threading.current_thread())
+            return dispatch(*args)
+
+        with mock.patch('users.views._parallel_reads', return_value=True), \
+                mock.patch('users.views._dispatch_subrequest', side_effect=record_thread):
+            response = self.client.post('/api/batch/', {
+                'email': 'member@example.com', 'password': 'password123',
+                'requests': [
+                    {'method': 'GET', 'path': '/api/profile/'},
+                    {'method': 'GET', 'path': '/api/nowhere/'},
+                    {'method': 'GET', 'path': '/api/active-info/'},
+                ],
+            }, content_type='application/json')
+        responses = response.json()['responses']
+        self.assertEqual([entry['status'] for entry in responses], [200, 404, 200])
+        self.assertEqual(responses[0]['body']['user']['email'], 'member@example.com')
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(threading.current_thread(), threads)
+        self.assertEqual(views._read_executor()._max_workers, 3)
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    PROFILING_ENABLED=True, PROFILING_TOKEN='profile-token', PROFILING_SAMPLE_RATE=0.0, PROFILING_MODE='cprofile',
+)
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.profiles = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profiles)
+        settings_override = self.settings(PROFILING_DIR=self.profiles)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        User.objects.create_superuser('admin@example.com', 'password123', fullname='Admin')
+        User.objects.create_user('member@example.com', 'password123', fullname='Member', is_approved=True)
+
+    def admin_headers(self, email='admin@example.com'):
+        return {'HTTP_X_ADMIN_EMAIL': email, 'HTTP_X_ADMIN_PASSWORD': 'password123'}
+
+    def test_token_header_profiles_the_request(self):
+        response = self.client.get('/api/stats/', HTTP_X_PROFILE='profile-token', **self.admin_headers())
+        self.assertEqual(response.status_code, 200)
+        name = response['X-Profile-Id']
+        self.assertTrue(name.endswith('-statistics.pstats'))
+
+        listed = self.client.get('/api/profiles/', **self.admin_headers()).json()
+        self.assertEqual([profile['name'] for profile in listed], [name])
+        download = self.client.get(f'/api/profiles/{name}/', **self.admin_headers())
+        self.assertEqual(download.status_code, 200)
+        self.assertGreater(len(b''.join(download.streaming_content)), 0)
+
+    def test_other_requests_are_not_profiled(self):
+        response = self.client.get('/api/stats/', HTTP_X_PROFILE='wrong-token', **self.admin_headers())
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(os.listdir(self.profiles), [])
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_MODE='sample')
+    def test_sampled_requests_save_collapsed_stacks(self):
+        response = self.client.get('/api/stats/', **self.admin_headers())
+        name = response['X-Profile-Id']
+        self.assertTrue(name.endswith('.collapsed'))
+        self.assertEqual(os.listdir(self.profiles), [name])
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled_middleware_removes_itself(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(lambda request: None)
+
+    def test_profiles_are_for_superusers_only(self):
+        response = self.client.get('/api/profiles/', **self.admin_headers('member@example.com'))
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {'error': 'Only superusers can view profiles'})
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.breaker = resilience.CircuitBreaker(
+            failure_threshold=3, failure_ratio=0.5, window_seconds=30, slow_seconds=1.0, reset_seconds=10
+        )
+
+    def test_fast_queries_in_between_do_not_reset_failures(self):
+        for _ in range(2):
+            self.breaker.record_success()
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, resilience.CLOSED)
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, resilience.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_rare_failures_under_load_keep_it_closed(self):
+        for _ in range(100):
+            self.breaker.record_success()
+        for _ in range(5):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, resilience.CLOSED)
+
+    def test_failures_leave_the_window(self):
+        with mock.patch('users.resilience.time.monotonic', return_value=1000.0):
+            self.breaker.record_failure()
+            self.breaker.record_failure()
+        with mock.patch('users.resilience.time.monotonic', return_value=1040.0):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, resilience.CLOSED)
+
+    def test_slow_queries_are_failures(self):
+        self.breaker.slow_seconds = -1
+        for _ in range(3):
+            self.assertEqual(self.breaker.time_query(lambda *args: 'rows', 'SELECT 1', (), False, {}), 'rows')
+        self.assertEqual(self.breaker.state, resilience.OPEN)
+
+    def open(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.breaker.opened_at -= self.breaker.reset_seconds
+
+    def test_probe_is_started_once_reset_time_passed(self):
+        self.open()
+        with mock.patch.object(self.breaker, '_probe') as probe:
+            self.assertFalse(self.breaker.allow())
+            self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.state, resilience.PROBING)
+        probe.assert_called_once()
+
+    def test_successful_probe_closes_it(self):
+        self.open()
+        self.breaker.state = resilience.PROBING
+        with mock.patch('users.resilience.connections'):
+            self.breaker._probe()
+        self.assertEqual(self.breaker.state, resilience.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_reopens_it(self):
+        self.open()
+        self.breaker.state = resilience.PROBING
+        with mock.patch('users.resilience.connections') as connections:
+            cursor = connections.__getitem__.return_value.cursor.return_value.__enter__.return_value
+            cursor.execute.side_effect = OperationalError('down')
+            self.breaker._probe()
+        self.assertEqual(self.breaker.state, resilience.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class DegradedModeTests(TestCase):
+    def setUp(self):
+        User.objects.create_user('member@example.com', 'password123', fullname='Member', is_approved=True)
+        breaker = resilience.breaker
+        breaker._buckets.clear()
+        self.addCleanup(setattr, breaker, 'failure_threshold', breaker.failure_threshold)
+        self.addCleanup(setattr, breaker, 'failure_ratio', breaker.failure_ratio)
+        self.addCleanup(setattr, breaker, 'state', resilience.CLOSED)
+        self.addCleanup(breaker._buckets.clear)
+        self.addCleanup(resilience.stale_responses._entries.clear)
+        self.addCleanup(resilience.credentials._entries.clear)
+
+    def get_feed(self, password='password123', query=''):
+        return self.client.get(f'/api/active-info/{query}', HTTP_X_USER_EMAIL='member@example.com',
+                               HTTP_X_USER_PASSWORD=password)
+
+    def test_stale_response_is_served_while_open(self):
+        fresh = self.get_feed()
+        self.assertEqual(fresh.status_code, 200)
+        resilience.breaker.state = resilience.OPEN
+        resilience.breaker.opened_at = time.monotonic()
+
+        with self.assertNumQueries(0):
+            stale = self.get_feed()
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale['X-Stale'], '1')
+        self.assertEqual(stale.content, fresh.content)
+        self.assertEqual(self.get_feed(password='wrong-password').status_code, 503)
+        self.assertEqual(self.get_feed(query='?fields=id').status_code, 503)
+
+    def test_database_errors_open_the_breaker(self):
+        self.get_feed()
+        resilience.breaker.failure_threshold = 1
+        resilience.breaker.failure_ratio = 0
+        with mock.patch('users.views.feed_cache.get', side_effect=OperationalError('canceling statement')):
+            response = self.get_feed()
+        self.assertEqual(response['X-Stale'], '1')
+        self.assertEqual(resilience.breaker.state, resilience.OPEN)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class FieldsetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser('admin@example.com', 'password123', fullname='Admin')
+        self.member = User.objects.create_user('member@example.com', 'password123', fullname='Member', is_approved=True)
+        for i in range(2):
+            ActiveInfo.objects.create(heading=f'Item {i}', description='Body', submitted_by=self.member,
+                                      approved_by=self.admin, approved_at=timezone.now())
+
+    def feed(self, query):
+        return self.client.get(f'/api/active-info/?{query}', HTTP_X_USER_EMAIL='member@example.com',
+                               HTTP_X_USER_PASSWORD='password123')
+
+    def test_unknown_names_are_rejected(self):
+        for query, error in [
+            ('fields=id,secret', 'Unknown field: secret'),
+            ('expand=heading', 'Field cannot be expanded: heading'),
+            ('fields=submitted_by.password', 'Unknown field: submitted_by.password'),
+        ]:
+            response = self.feed(query)
+            self.assertEqual(response.status_code, 400, query)
+            self.assertEqual(response.json(), {'error': error})
+
+    def test_unrequested_columns_are_not_loaded(self):
+        fieldset = Fieldset(fields={'id', 'heading', 'submitted_by'}, nested={'submitted_by': {'fullname'}},
+                            expand={'submitted_by'})
+        with self.assertNumQueries(1):
+            item = fieldset.apply(ActiveInfo.objects.all(), ActiveInfoSerializer)[0]
+            self.assertEqual(item.submitted_by.fullname, 'Member')
+        self.assertTrue({'description', 'image', 'approved_by_id', 'fingerprint'} <= item.get_deferred_fields())
+        self.assertNotIn('heading', item.get_deferred_fields())
+        self.assertIn('password', item.submitted_by.get_deferred_fields())
+
+        response = self.feed('fields=id,submitted_by.fullname')
+        self.assertEqual(response.json()[0], {'id': response.json()[0]['id'], 'submitted_by': {'fullname': 'Member'}})
+
+    def test_normalized_responses_side_load_each_user_once(self):
+        body = self.feed('normalized=true').json()
+        self.assertEqual(len(body['items']), 2)
+        self.assertEqual({item['submitted_by_id'] for item in body['items']}, {self.member.id})
+        self.assertEqual(set(body['users']), {str(self.member.id), str(self.admin.id)})
+        self.assertNotIn('password', body['users'][str(self.member.id)])
+
+        body = self.feed('normalized=true&fields=id,submitted_by.fullname').json()
+        self.assertEqual(body['items'][0].keys(), {'id', 'submitted_by_id'})
+        self.assertEqual(body['users'], {str(self.member.id): {'fullname': 'Member'}})
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ByIdsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser('admin@example.com', 'password123', fullname='Admin')
+        self.member = User.objects.create_user('member@example.com', 'password123', fullname='Member', is_approved=True)
+        self.other = User.objects.create_user('other@example.com', 'password123', fullname='Other', is_approved=True)
+
+    def get(self, path, ids, email='member@example.com'):
+        return self.client.get(f'{path}?ids={",".join(map(str, ids))}', HTTP_X_USER_EMAIL=email,
+                               HTTP_X_USER_PASSWORD='password123')
+
+    def test_results_follow_request_order_with_not_found(self):
+        items = [ActiveInfo.objects.create(heading=f'Item {i}', description='Body', submitted_by=self.member,
+                                           approved_by=self.admin, approved_at=timezone.now()) for i in range(3)]
+        ids = [items[2].id, 999999, items[0].id]
+        for _ in range(2):  # the second round is served from the item cache
+            results = self.get('/api/active-info/by-ids/', ids).json()['results']
+            self.assertEqual([item['id'] for item in results], ids)
+            self.assertEqual([bool(item.get('not_found')) for item in results], [False, True, False])
+        self.assertEqual(len(item_cache.get_many(item_cache.ACTIVE, ids)), 2)
+
+    def test_cached_pending_items_stay_private_to_their_owner(self):
+        info = PendingInfo.objects.create(heading='Mine', description='Body', submitted_by=self.member)
+        path = '/api/my-submissions/pending/by-ids/'
+        self.assertEqual(self.get(path, [info.id]).json()['results'][0]['heading'], 'Mine')
+        self.assertIn(info.id, item_cache.get_many(item_cache.PENDING, [info.id]))
+
+        self.assertEqual(self.get(path, [info.id], email='other@example.com').json()['results'],
+                         [{'id': info.id, 'not_found': True}])
+
+    def test_cached_items_need_an_approved_user(self):
+        info = ActiveInfo.objects.create(heading='Item', description='Body', submitted_by=self.member,
+                                         approved_by=self.admin, approved_at=timezone.now())
+        self.assertEqual(self.get('/api/active-info/by-ids/', [info.id]).status_code, 200)
+        User.objects.filter(pk=self.other.pk).update(is_approved=False)
+        self.assertEqual(self.get('/api/active-info/by-ids/', [info.id], email='other@example.com').status_code, 403)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class TimelineTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin@example.com', 'password123', fullname='Admin')
+        self.member = User.objects.create_user('member@example.com', 'password123', fullname='Member', is_approved=True)
+
+    def pending(self, when, status='pending'):
+        info = PendingInfo.objects.create(heading='Pending', description='Body', submitted_by=self.member, status=status)
+        PendingInfo.objects.filter(pk=info.pk).update(submitted_at=when)
+        return (timeline.PENDING, info.pk)
+
+    def active(self, when):
+        info = ActiveInfo.objects.create(heading='Active', description='Body', submitted_by=self.member,
+                                         approved_by=self.admin, approved_at=when)
+        return (timeline.ACTIVE, info.pk)
+
+    def walk(self, limit):
+        entries, cursor = timeline.page(self.member, limit=limit)
+        while cursor is not None:
+            more, cursor = timeline.page(self.member, timeline.decode_cursor(cursor), limit)
+            entries += more
+        return entries
+
+    def test_ties_across_kinds_are_paged_without_gaps_or_repeats(self):
+        when = timezone.now()
+        entries = [self.pending(when), self.active(when), self.pending(when, 'rejected'), self.active(when),
+                   self.pending(when - timedelta(minutes=1))]
+        # Newest first, then by kind and id, both descending
+        expected = sorted(entries[:4], key=lambda entry: (entry[0], entry[1]), reverse=True) + entries[4:]
+        for limit in (1, 2, 3, 5):
+            self.assertEqual(self.walk(limit), expected, f'limit={limit}')
+
+    def test_cursor_at_the_last_row_ends_the_timeline(self):
+        when = timezone.now()
+        self.active(when - timedelta(minutes=1))
+        last = self.pending(when - timedelta(minutes=2))
+        entries, cursor = timeline.page(self.member, limit=2)
+        self.assertEqual(entries[-1], last)
+        self.assertIsNone(cursor)
+        self.assertEqual(timeline.page(self.member, (when - timedelta(minutes=2), *last), 2), ([], None))
+
+    def test_approved_submission_appears_once(self):
+        info = PendingInfo.objects.create(heading='Story', description='Body', submitted_by=self.member)
+        info.approve(self.admin)
+        entries, _ = timeline.page(self.member)
+        self.assertEqual(entries, [(timeline.ACTIVE, ActiveInfo.objects.get().pk)])
+
+    def test_malformed_cursors_are_rejected(self):
+        def encode(value):
+            return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip('=')
+
+        cursors = ['not-a-cursor', '!!!', encode({'a': 1}), encode(5), encode(['yesterday', 'pending', 1]),
+                   encode([None, 'pending', 1]), encode([timezone.now().isoformat(), 'other', 1]),
+                   encode([timezone.now().isoformat(), 'active', '1'])]
+        for cursor in cursors:
+            response = self.client.generic(
+                'GET', f'/api/my-submissions/?cursor={cursor}',
+                json.dumps({'email': 'member@example.com', 'password': 'password123'}),
+                content_type='application/json',
+            )
+            self.assertEqual(response.status_code, 400, cursor)
@@ -0,0 +1,75 @@
+"""
+Keyset-paginated timeline of one user's submissions.
+
+The timeline is a single UNION ALL of the user's ActiveInfo rows (keyed by
+approved_at) and their PendingInfo rows that were not approved (keyed by
+submitted_at). An approved submission therefore shows up once, as its
+ActiveInfo. Entries are ordered newest first by (timestamp, kind, id), and
+each page resumes strictly after the previous page's last entry. Both
+branches run on a (submitted_by, timestamp) index, so a page costs the same
+however long the user's history is.
+"""
+
+import base64
+import binascii
+import json
+
+from django.db.models import F, Q, Value
+from django.utils.dateparse import parse_datetime
+
+from .models import PendingInfo, ActiveInfo
+
+PENDING = 'pending'
+ACTIVE = 'active'
+
+
+class CursorError(ValueError):
+    """Raised for cursors that were not produced by encode_cursor"""
+
+
+def encode_cursor(timestamp, kind, item_id):
+    raw = json.dumps([timestamp.isoformat(), kind, item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        timestamp, kind, item_id = json.loads(raw)
+        timestamp = parse_datetime(timestamp)
+    except (binascii.Error, ValueError, TypeError):
+        raise CursorError('Invalid cursor')
+    if timestamp is None or kind not in (PENDING, ACTIVE) or not isinstance(item_id, int):
+        raise CursorError('Invalid cursor')
+    return timestamp, kind, item_id
+
+
+def _after(field, kind, cursor):
+    """Rows of one branch that sort after the cursor in (timestamp, kind, id) DESC order"""
+    timestamp, cursor_kind, item_id = cursor
+    condition = Q(**{f'{field}__lt': timestamp})
+    if kind < cursor_kind:
+        condition |= Q(**{field: timestamp})
+    elif kind == cursor_kind:
+        condition |= Q(**{field: timestamp, 'id__lt': item_id})
+    return condition
+
+
+def page(user, cursor=None, limit=20):
+    """
+    One page of the user's timeline.
+
+    Returns ([(kind, id), ...], next_cursor); next_cursor is None on the last page.
+    """
+    pending = PendingInfo.objects.filter(submitted_by=user).exclude(status='approved')
+    active = ActiveInfo.objects.filter(submitted_by=user)
+    if cursor is not None:
+        pending = pending.filter(_after('submitted_at', PENDING, cursor))
+        active = active.filter(_after('approved_at', ACTIVE, cursor))
+
+    pending = pending.annotate(ts=F('submitted_at'), kind=Value(PENDING)).values_list('ts', 'kind', 'id')
+    active = active.annotate(ts=F('approved_at'), kind=Value(ACTIVE)).values_list('ts', 'kind', 'id')
+    rows = list(pending.union(active, all=True).order_by('-ts', '-kind', '-id')[:limit + 1])
+
+    next_cursor = encode_cursor(*rows[limit - 1]) if len(rows) > limit else None
+    return [(kind, item_id) for _, kind, item_id in rows[:limit]], next_cursor
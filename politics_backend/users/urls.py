@@ -10,6 +10,7 @@ urlpatterns = [
     # Admin endpoints (for approval workflow)
     path('api/pending-users/', views.get_pending_users, name='pending_users'),
     path('api/approve-user/<int:user_id>/', views.approve_user, name='approve_user'),
+    path('api/stats/', views.get_statistics, name='statistics'),
     
     # Protected endpoint example
     path('api/protected/', views.protected_endpoint, name='protected'),
@@ -18,8 +19,21 @@ urlpatterns = [
     path('api/submit-info/', views.submit_info, name='submit_info'),
     path('api/pending-info/', views.get_pending_info, name='pending_info'),
     path('api/active-info/', views.get_active_info, name='active_info'),
+    path('api/active-info/by-ids/', views.get_active_info_by_ids, name='active_info_by_ids'),
     path('api/approve-info/<int:info_id>/', views.approve_info, name='approve_info'),
     path('api/reject-info/<int:info_id>/', views.reject_info, name='reject_info'),
     path('api/my-submissions/', views.get_my_submissions, name='my_submissions'),
+    path('api/my-submissions/pending/by-ids/', views.get_my_pending_by_ids, name='my_pending_by_ids'),
+    path('api/duplicates/rebuild/', views.rebuild_duplicate_index, name='rebuild_duplicates'),
+    
+    # Uploaded images (signed URLs from the information endpoints)
+    path('api/media/<str:signature>/<path:path>', views.serve_media, name='media'),
+    
+    # Captured request profiles (see PROFILING_* settings)
+    path('api/profiles/', views.list_profiles, name='list_profiles'),
+    path('api/profiles/<str:name>/', views.download_profile, name='download_profile'),
+    
+    # Several API calls in one round trip
+    path('api/batch/', views.batch_request, name='batch'),
     
 ]
\ No newline at end of file
@@ -1,12 +1,67 @@
 from rest_framework import status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+import functools
+import json
+import logging
+import mimetypes
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import quote
+
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth import get_user_model
+from django.db import close_old_connections, connections, transaction
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, QueryDict, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+from django.urls import Resolver404, resolve
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare
 User = get_user_model()
-from .serializers import UserSerializer, UserRegistrationSerializer, UserApprovalSerializer, PendingInfoSerializer, ActiveInfoSerializer
+from .serializers import UserSerializer, UserRegistrationSerializer, UserApprovalSerializer, PendingInfoSerializer, ActiveInfoSerializer, side_load_users
 from .models import PendingInfo, ActiveInfo
+from . import counters, duplicates, feed_cache, item_cache, media, profiling, timeline
+from .resilience import credentials, degradable
+from .storage import is_hashed_name
+from .fieldsets import Fieldset, FieldsetError
+
+logger = logging.getLogger(__name__)
+
+class BatchCredentials:
+    """Credentials verified once by batch_request and trusted by its sub-requests"""
+    def __init__(self, user, password):
+        self.user = user
+        self.password = password
+    
+    def matches(self, user_or_email, password):
+        email = getattr(user_or_email, 'email', user_or_email)
+        return email == self.user.email and constant_time_compare(password, self.password)
+
+def _authenticate(request, email, password):
+    """authenticate(), skipping the password hash for credentials a batch already verified"""
+    verified = getattr(request, 'batch_credentials', None)
+    if verified is not None and verified.matches(email, password):
+        return verified.user
+    user = authenticate(request, username=email, password=password)
+    if user is not None:
+        # Lets degradable views check these credentials while the database is down
+        credentials.remember(user)
+    return user
+
+def _check_password(request, user, password):
+    """user.check_password(), skipping the hash for credentials a batch already verified"""
+    verified = getattr(request, 'batch_credentials', None)
+    if verified is not None and verified.matches(user, password):
+        return True
+    if not user.check_password(password):
+        return False
+    credentials.remember(user)
+    return True
 
 def require_admin(func):
     """Decorator to require admin privileges (password-based, no cookies/tokens)"""
@@ -28,7 +83,7 @@ def require_admin(func):
             return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
         
         # Verify password
-        if not user.check_password(password):
+        if not _check_password(request, user, password):
             return Response({'error': 'Invalid password'}, status=status.HTTP_401_UNAUTHORIZED)
         
         # Check if user has admin privileges
@@ -61,7 +116,7 @@ def login_user(request):
     if not email or not password:
         return Response({'error': 'Email and password are required'}, status=status.HTTP_400_BAD_REQUEST)
     
-    user = authenticate(request, username=email, password=password)
+    user = _authenticate(request, email, password)
     
     if user is not None:
         if not user.is_approved:
@@ -88,7 +143,7 @@ def get_user_profile(request):
     
     try:
         user = User.objects.get(email=email)
-        if not user.check_password(password):
+        if not _check_password(request, user, password):
             return Response({'error': 'Invalid password'}, status=status.HTTP_401_UNAUTHORIZED)
         
         return Response({
@@ -140,7 +195,7 @@ def get_pending_users(request):
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
     
     # Verify password
-    if not user.check_password(password):
+    if not _check_password(request, user, password):
         return Response({'error': 'Invalid admin password'}, status=status.HTTP_401_UNAUTHORIZED)
     
     # Only superusers and admins can view pending users
@@ -153,6 +208,17 @@ def get_pending_users(request):
     serializer = UserSerializer(pending_users, many=True)
     return Response(serializer.data)
 
+@degradable('X-Admin', lambda user: user.can_approve_users())
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def get_statistics(request):
+    """Get dashboard statistics from the maintained counters (Admin only)"""
+    user, error = _admin_from_headers(request, 'Only superusers and admins can view statistics')
+    if error:
+        return error
+    
+    return Response(counters.snapshot())
+
 @api_view(['GET'])
 def protected_endpoint(request):
     """Example protected endpoint that only approved users can access"""
@@ -172,7 +238,7 @@ def submit_info(request):
     if not email or not password:
         return Response({'error': 'Email and password required'}, status=status.HTTP_400_BAD_REQUEST)
     
-    user = authenticate(request, username=email, password=password)
+    user = _authenticate(request, email, password)
     if not user:
         return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
     
@@ -191,28 +257,89 @@ def submit_info(request):
         # Check if user is superuser or admin - if so, approve directly
         if user.can_approve_users():
             # Superuser/admin: Create ActiveInfo directly
-            active_info = ActiveInfo.objects.create(
-                heading=serializer.validated_data['heading'],
-                description=serializer.validated_data['description'],
-                image=serializer.validated_data.get('image'),
-                submitted_by=user,
-                approved_by=user,
-                approved_at=timezone.now()
-            )
+            with transaction.atomic():
+                active_info = ActiveInfo.objects.create(
+                    heading=serializer.validated_data['heading'],
+                    description=serializer.validated_data['description'],
+                    image=serializer.validated_data.get('image'),
+                    submitted_by=user,
+                    approved_by=user,
+                    approved_at=timezone.now()
+                )
+            duplicates.index.add(duplicates.ACTIVE, active_info.id, active_info.fingerprint, active_info.approved_at)
             return Response({
                 'message': 'Information submitted and approved directly (admin privilege)',
                 'active_info': ActiveInfoSerializer(active_info).data
             }, status=status.HTTP_201_CREATED)
         else:
-            # Regular user: Create PendingInfo
-            pending_info = serializer.save(submitted_by=user)
+            # Regular user: Create PendingInfo, flagged if it repeats a recent item
+            duplicate = _find_duplicate(duplicates.fingerprint(
+                serializer.validated_data['heading'], serializer.validated_data['description']
+            ))
+            if duplicate is not None and settings.INFO_DUPLICATE_POLICY == 'merge':
+                merged = _merge_duplicate(serializer, user, duplicate)
+                if merged is not None:
+                    return merged
+            
+            with transaction.atomic():
+                if isinstance(duplicate, ActiveInfo):
+                    pending_info = serializer.save(submitted_by=user, duplicate_of_active=duplicate)
+                else:
+                    pending_info = serializer.save(submitted_by=user, duplicate_of_pending=duplicate)
+            duplicates.index.add(duplicates.PENDING, pending_info.id, pending_info.fingerprint, pending_info.submitted_at)
+            message = 'Information submitted successfully for approval'
+            if duplicate is not None:
+                message += ' (flagged as a possible duplicate)'
             return Response({
-                'message': 'Information submitted successfully for approval',
+                'message': message,
                 'pending_info': PendingInfoSerializer(pending_info).data
             }, status=status.HTTP_201_CREATED)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+def _find_duplicate(fingerprint):
+    """Recent PendingInfo or ActiveInfo nearly matching the fingerprint, or None"""
+    if settings.INFO_DUPLICATE_POLICY == 'off':
+        return None
+    while True:
+        match = duplicates.index.find(fingerprint)
+        if match is None:
+            return None
+        kind, info_id, _ = match
+        model = PendingInfo if kind == duplicates.PENDING else ActiveInfo
+        item = model.objects.filter(id=info_id).first()
+        if item is not None:
+            return item
+        # Archived or deleted since it was indexed
+        duplicates.index.discard(kind, info_id)
+
+def _merge_duplicate(serializer, user, duplicate):
+    """Fold a resubmission into the item it duplicates; None when it must be queued instead"""
+    if isinstance(duplicate, ActiveInfo):
+        return Response({
+            'message': 'This information has already been published',
+            'active_info': ActiveInfoSerializer(duplicate).data
+        }, status=status.HTTP_200_OK)
+    
+    if duplicate.submitted_by_id != user.id:
+        return None
+    with transaction.atomic():
+        pending_info = PendingInfo.objects.select_for_update().filter(id=duplicate.id, status='pending').first()
+        if pending_info is None:
+            return None
+        # The latest edit replaces the queued one
+        pending_info.heading = serializer.validated_data['heading']
+        pending_info.description = serializer.validated_data['description']
+        if serializer.validated_data.get('image'):
+            pending_info.image = serializer.validated_data['image']
+        pending_info.save()
+    duplicates.index.add(duplicates.PENDING, pending_info.id, pending_info.fingerprint, pending_info.submitted_at)
+    return Response({
+        'message': 'Information merged into your pending submission',
+        'pending_info': PendingInfoSerializer(pending_info).data
+    }, status=status.HTTP_200_OK)
+
+@degradable('X-Admin', lambda user: user.can_approve_users())
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def get_pending_info(request):
@@ -234,7 +361,7 @@ def get_pending_info(request):
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
     
     # Verify password
-    if not user.check_password(password):
+    if not _check_password(request, user, password):
         return Response({'error': 'Invalid admin password'}, status=status.HTTP_401_UNAUTHORIZED)
     
     # Only superusers and admins can view pending info
@@ -243,10 +370,22 @@ def get_pending_info(request):
             'error': 'Only superusers and admins can view pending information'
         }, status=status.HTTP_403_FORBIDDEN)
     
+    try:
+        fieldset = Fieldset.from_request(request, PendingInfoSerializer)
+    except FieldsetError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
     pending_info = PendingInfo.objects.filter(status='pending').order_by('-submitted_at')
-    serializer = PendingInfoSerializer(pending_info, many=True)
+    pending_info = fieldset.apply(pending_info, PendingInfoSerializer)
+    serializer = PendingInfoSerializer(pending_info, many=True, fieldset=fieldset)
+    if fieldset.normalized:
+        return Response({
+            'items': serializer.data,
+            'users': side_load_users(fieldset, (PendingInfoSerializer, serializer.data))
+        })
     return Response(serializer.data)
 
+@degradable('X-User', lambda user: user.is_approved)
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def get_active_info(request):
@@ -258,16 +397,123 @@ def get_active_info(request):
     if not email or not password:
         return Response({'error': 'Email and password required'}, status=status.HTTP_400_BAD_REQUEST)
     
-    user = authenticate(request, username=email, password=password)
+    user = _authenticate(request, email, password)
     if not user:
         return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
     
     if not user.is_approved:
         return Response({'error': 'Account not approved yet'}, status=status.HTTP_403_FORBIDDEN)
     
+    try:
+        fieldset = Fieldset.from_request(request, ActiveInfoSerializer)
+    except FieldsetError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # The feed is the same for every approved user: serve JSON pages from the feed cache
+    cacheable = request.accepted_renderer.format == 'json'
+    if cacheable:
+        cache_key = feed_cache.key_for(request, 'active_info')
+        entry = feed_cache.get(cache_key)
+        if entry is not None:
+            return feed_cache.response(entry)
+    
     active_info = ActiveInfo.objects.all().order_by('-approved_at')
-    serializer = ActiveInfoSerializer(active_info, many=True)
-    return Response(serializer.data)
+    active_info = fieldset.apply(active_info, ActiveInfoSerializer)
+    serializer = ActiveInfoSerializer(active_info, many=True, fieldset=fieldset)
+    if fieldset.normalized:
+        data = {
+            'items': serializer.data,
+            'users': side_load_users(fieldset, (ActiveInfoSerializer, serializer.data))
+        }
+    else:
+        data = serializer.data
+    
+    if cacheable:
+        return feed_cache.response(feed_cache.store(cache_key, request.accepted_renderer.render(data)))
+    return Response(data)
+
+def _user_from_headers(request):
+    """Resolve the X-User-Email/X-User-Password headers to an approved user, or return an error Response"""
+    email = request.headers.get('X-User-Email')
+    password = request.headers.get('X-User-Password')
+    
+    if not email or not password:
+        return None, Response({'error': 'Email and password required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    user = _authenticate(request, email, password)
+    if not user:
+        return None, Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
+    
+    if not user.is_approved:
+        return None, Response({'error': 'Account not approved yet'}, status=status.HTTP_403_FORBIDDEN)
+    return user, None
+
+def _get_by_ids(request, queryset, serializer_class, cache_kind, owner=None):
+    """
+    Serialize the items named by ?ids= in request order.
+    
+    Full representations come from the item cache where possible; the rest
+    are loaded with one IN query. Unknown ids (or, with `owner`, other users'
+    items) are returned as {"id": ..., "not_found": true}.
+    """
+    try:
+        ids = list(dict.fromkeys(int(part) for part in request.query_params.get('ids', '').split(',') if part.strip()))
+    except ValueError:
+        return Response({'error': 'ids must be a comma-separated list of integers'}, status=status.HTTP_400_BAD_REQUEST)
+    if not ids:
+        return Response({'error': 'ids required'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(ids) > settings.INFO_MULTI_GET_MAX:
+        return Response({
+            'error': f'At most {settings.INFO_MULTI_GET_MAX} ids per request'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        fieldset = Fieldset.from_request(request, serializer_class)
+    except FieldsetError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # The cache holds full representations only
+    found = item_cache.get_many(cache_kind, ids) if fieldset.is_full else {}
+    if owner is not None:
+        found = {item_id: data for item_id, data in found.items() if data['submitted_by']['id'] == owner.id}
+    
+    missing = [item_id for item_id in ids if item_id not in found]
+    if missing:
+        items = list(fieldset.apply(queryset.filter(id__in=missing), serializer_class))
+        data = serializer_class(items, many=True, fieldset=fieldset).data
+        loaded = {item.pk: item_data for item, item_data in zip(items, data)}
+        if fieldset.is_full and loaded:
+            item_cache.set_many(cache_kind, loaded)
+        found.update(loaded)
+    
+    results = [found.get(item_id) or {'id': item_id, 'not_found': True} for item_id in ids]
+    response = {'results': results}
+    if fieldset.normalized:
+        response['users'] = side_load_users(
+            fieldset, (serializer_class, [item for item in results if not item.get('not_found')])
+        )
+    return Response(response)
+
+@degradable('X-User', lambda user: user.is_approved)
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def get_active_info_by_ids(request):
+    """Get active information items by id: ?ids=1,2,3 (Available to all approved users)"""
+    user, error = _user_from_headers(request)
+    if error:
+        return error
+    return _get_by_ids(request, ActiveInfo.objects.all(), ActiveInfoSerializer, item_cache.ACTIVE)
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def get_my_pending_by_ids(request):
+    """Get the current user's pending submissions by id: ?ids=1,2,3"""
+    user, error = _user_from_headers(request)
+    if error:
+        return error
+    return _get_by_ids(
+        request, PendingInfo.objects.filter(submitted_by=user), PendingInfoSerializer, item_cache.PENDING, owner=user
+    )
 
 @api_view(['POST'])
 @require_admin
@@ -304,7 +550,7 @@ def reject_info(request, user, info_id):
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def get_my_submissions(request):
-    """Get current user's submissions"""
+    """Get current user's submissions, newest first, one page at a time"""
     # For regular users, just require email and password
     email = request.data.get('email')
     password = request.data.get('password')
@@ -312,22 +558,304 @@ def get_my_submissions(request):
     if not email or not password:
         return Response({'error': 'Email and password required'}, status=status.HTTP_400_BAD_REQUEST)
     
-    user = authenticate(request, username=email, password=password)
+    user = _authenticate(request, email, password)
     if not user:
         return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
     
     if not user.is_approved:
         return Response({'error': 'Account not approved yet'}, status=status.HTTP_403_FORBIDDEN)
     
-    # Get pending submissions
-    pending_submissions = PendingInfo.objects.filter(submitted_by=user).order_by('-submitted_at')
-    pending_serializer = PendingInfoSerializer(pending_submissions, many=True)
+    try:
+        fieldset = Fieldset.from_request(request, PendingInfoSerializer, ActiveInfoSerializer)
+    except FieldsetError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        cursor = request.query_params.get('cursor')
+        cursor = timeline.decode_cursor(cursor) if cursor else None
+    except timeline.CursorError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        page_size = int(request.query_params.get('page_size', settings.MY_SUBMISSIONS_PAGE_SIZE))
+    except ValueError:
+        return Response({'error': 'page_size must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    page_size = max(1, min(page_size, settings.MY_SUBMISSIONS_MAX_PAGE_SIZE))
+    
+    # One page of the merged pending/approved timeline, then one IN query per kind
+    entries, next_cursor = timeline.page(user, cursor, page_size)
+    pending_ids = [item_id for kind, item_id in entries if kind == timeline.PENDING]
+    active_ids = [item_id for kind, item_id in entries if kind == timeline.ACTIVE]
+    
+    pending_submissions = list(fieldset.apply(PendingInfo.objects.filter(id__in=pending_ids), PendingInfoSerializer))
+    pending_data = PendingInfoSerializer(pending_submissions, many=True, fieldset=fieldset).data
+    active_submissions = list(fieldset.apply(ActiveInfo.objects.filter(id__in=active_ids), ActiveInfoSerializer))
+    active_data = ActiveInfoSerializer(active_submissions, many=True, fieldset=fieldset).data
+    
+    serialized = {}
+    for kind, items, data in ((timeline.PENDING, pending_submissions, pending_data),
+                              (timeline.ACTIVE, active_submissions, active_data)):
+        for item, item_data in zip(items, data):
+            serialized[kind, item.pk] = {'type': kind, **item_data}
+    
+    response = {
+        'results': [serialized[entry] for entry in entries if entry in serialized],
+        'next_cursor': next_cursor
+    }
+    if fieldset.normalized:
+        response['users'] = side_load_users(
+            fieldset,
+            (PendingInfoSerializer, pending_data),
+            (ActiveInfoSerializer, active_data)
+        )
+    return Response(response)
+
+def _build_subrequest(request, spec, credentials):
+    """Turn one entry of a batch into an HttpRequest carrying the batch credentials"""
+    method = str(spec.get('method', 'GET')).upper()
+    path, _, query_string = str(spec.get('path', '')).partition('?')
+    body = dict(spec.get('body') or {})
+    body.setdefault('email', credentials.user.email)
+    body.setdefault('password', credentials.password)
+    content = json.dumps(body).encode()
+    
+    sub = HttpRequest()
+    sub.method = method
+    sub.path = sub.path_info = path
+    sub.META = {
+        'REQUEST_METHOD': method,
+        'QUERY_STRING': query_string,
+        'SERVER_NAME': request.META.get('SERVER_NAME', 'localhost'),
+        'SERVER_PORT': request.META.get('SERVER_PORT', '80'),
+        'HTTP_HOST': request.get_host(),
+        'HTTP_ACCEPT': 'application/json',
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(content)),
+        'HTTP_X_USER_EMAIL': credentials.user.email,
+        'HTTP_X_USER_PASSWORD': credentials.password,
+        'HTTP_X_ADMIN_EMAIL': credentials.user.email,
+        'HTTP_X_ADMIN_PASSWORD': credentials.password,
+    }
+    sub.GET = QueryDict(query_string)
+    sub._stream = BytesIO(content)
+    sub._read_started = False
+    sub.batch_credentials = credentials
+    return sub
+
+def _dispatch_subrequest(request, spec, credentials, threaded=False):
+    """Run one batch entry through its view and return {'status', 'body'}"""
+    try:
+        sub = _build_subrequest(request, spec, credentials)
+        try:
+            match = resolve(sub.path_info)
+        except Resolver404:
+            return {'status': status.HTTP_404_NOT_FOUND, 'body': {'error': 'Not found'}}
+        if match.func is batch_request:
+            return {'status': status.HTTP_400_BAD_REQUEST, 'body': {'error': 'Batch requests cannot be nested'}}
+        
+        response = match.func(sub, *match.args, **match.kwargs)
+        if response.streaming:
+            # File downloads (media, profiles) have no JSON body to embed
+            response.close()
+            return {'status': status.HTTP_400_BAD_REQUEST,
+                    'body': {'error': 'Streaming responses cannot be batched'}}
+        if hasattr(response, 'data'):
+            body = response.data
+        else:
+            body = json.loads(response.content) if response.content else None
+        return {'status': response.status_code, 'body': body}
+    except Http404:
+        return {'status': status.HTTP_404_NOT_FOUND, 'body': {'error': 'Not found'}}
+    except Exception:
+        # The message may expose internals; it goes to the log only
+        logger.exception('Batch sub-request %s %s failed', spec.get('method'), spec.get('path'))
+        return {'status': status.HTTP_500_INTERNAL_SERVER_ERROR, 'body': {'error': 'Internal server error'}}
+    finally:
+        if threaded:
+            # Worker threads hold their own DB connection; keep it only as
+            # long as CONN_MAX_AGE (or the pool) allows
+            close_old_connections()
+
+def _parallel_reads():
+    """
+    Whether batch reads may run on worker threads.
+    
+    Each thread uses its own database connection, so this only pays off when
+    connections are reused (persistent via CONN_MAX_AGE, or pooled); otherwise
+    every read would open a new connection and reads run on the request's one.
+    """
+    database = connections['default'].settings_dict
+    return database['CONN_MAX_AGE'] != 0 or bool(database['OPTIONS'].get('pool'))
+
+@functools.cache
+def _read_executor():
+    # Long-lived, so its threads keep their persistent connections between batches
+    return ThreadPoolExecutor(max_workers=settings.BATCH_MAX_WORKERS, thread_name_prefix='batch-read')
+
+@api_view(['POST'])
+@permission_classes([permissions.AllowAny])
+def batch_request(request):
+    """Run several API calls in one round trip, authenticating once"""
+    email = request.data.get('email')
+    password = request.data.get('password')
+    specs = request.data.get('requests')
+    
+    if not email or not password:
+        return Response({'error': 'Email and password required'}, status=status.HTTP_400_BAD_REQUEST)
+    if not isinstance(specs, list) or not specs:
+        return Response({'error': 'requests must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(specs) > settings.BATCH_MAX_REQUESTS:
+        return Response({
+            'error': f'At most {settings.BATCH_MAX_REQUESTS} requests per batch'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if not all(isinstance(spec, dict) for spec in specs):
+        return Response({'error': 'Each request must be an object'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    user = authenticate(request, username=email, password=password)
+    if not user:
+        return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
+    credentials = BatchCredentials(user, password)
+    
+    # Consecutive read-only requests run in parallel when connections are
+    # reused; writes run alone, in order, so later requests in the batch
+    # observe their effects.
+    results = [None] * len(specs)
+    reads = []
+    
+    def flush_reads():
+        if len(reads) > 1 and _parallel_reads():
+            futures = {i: _read_executor().submit(_dispatch_subrequest, request, specs[i], credentials, True)
+                       for i in reads}
+            for i, future in futures.items():
+                results[i] = future.result()
+        else:
+            for i in reads:
+                results[i] = _dispatch_subrequest(request, specs[i], credentials)
+        reads.clear()
     
-    # Get approved submissions
-    approved_submissions = ActiveInfo.objects.filter(submitted_by=user).order_by('-approved_at')
-    approved_serializer = ActiveInfoSerializer(approved_submissions, many=True)
+    for i, spec in enumerate(specs):
+        if str(spec.get('method', 'GET')).upper() in ('GET', 'HEAD', 'OPTIONS'):
+            reads.append(i)
+        else:
+            flush_reads()
+            results[i] = _dispatch_subrequest(request, spec, credentials)
+    flush_reads()
     
+    return Response({'responses': results})
+
+@require_safe
+def serve_media(request, signature, path):
+    """Serve an uploaded image from a signed URL (no password check per image)"""
+    if not media.verify(path, signature):
+        raise Http404('Invalid media signature')
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Invalid media path')
+    if not os.path.isfile(full_path):
+        raise Http404('Media file not found')
+    
+    stat = os.stat(full_path)
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    etag = quote_etag(f'{stat.st_size:x}-{int(stat.st_mtime):x}')
+    if media.is_private(path):
+        # Unreviewed uploads stay out of shared caches and may be rejected
+        cache_control = f'private, max-age={settings.MEDIA_PRIVATE_URL_MAX_AGE}'
+    elif is_hashed_name(path):
+        # The name embeds a content hash, so the bytes behind this URL never change
+        cache_control = 'public, max-age=31536000, immutable'
+    else:
+        cache_control = f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+    
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponse(status=304)
+    elif settings.MEDIA_DELIVERY == 'x-accel-redirect':
+        # nginx serves the bytes (including Range requests) from an internal location
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path)
+    elif settings.MEDIA_DELIVERY == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = full_path
+    else:
+        try:
+            byte_range = media.parse_range(request.headers.get('Range'), stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        if byte_range is None:
+            response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                media.iter_range(open(full_path, 'rb'), start, end),
+                status=206, content_type=content_type
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = str(end - start + 1)
+        response['Accept-Ranges'] = 'bytes'
+    
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    return response
+
+def _admin_from_headers(request, forbidden_message):
+    """
+    Resolve the X-Admin-Email/X-Admin-Password headers to a superuser.
+    
+    Returns (user, None), or (None, error Response); `forbidden_message` is
+    the 403 text for valid credentials of a user who is not a superuser.
+    """
+    password = request.headers.get('X-Admin-Password')
+    if not password:
+        return None, Response({'error': 'Admin password required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    email = request.headers.get('X-Admin-Email')
+    if not email:
+        return None, Response({'error': 'Admin email required'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        user = User.objects.get(email=email)
+    except User.DoesNotExist:
+        return None, Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if not _check_password(request, user, password):
+        return None, Response({'error': 'Invalid admin password'}, status=status.HTTP_401_UNAUTHORIZED)
+    
+    if not user.can_approve_users():
+        return None, Response({'error': forbidden_message}, status=status.HTTP_403_FORBIDDEN)
+    return user, None
+
+@api_view(['POST'])
+@require_admin
+def rebuild_duplicate_index(request, user):
+    """Backfill missing fingerprints and rebuild the near-duplicate index (Admin only)"""
+    backfilled = duplicates.backfill_fingerprints()
+    duplicates.bump_version()
+    indexed = duplicates.index.rebuild()
     return Response({
-        'pending_submissions': pending_serializer.data,
-        'approved_submissions': approved_serializer.data
+        'message': 'Duplicate index rebuilt; other workers rebuild on their next refresh',
+        'fingerprints_backfilled': backfilled,
+        'items_indexed': indexed,
+        'refresh_seconds': settings.INFO_DUPLICATE_REFRESH_SECONDS
     })
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def list_profiles(request):
+    """List recently captured request profiles (Admin only)"""
+    user, error = _admin_from_headers(request, 'Only superusers can view profiles')
+    if error:
+        return error
+    return Response(profiling.list_profiles())
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def download_profile(request, name):
+    """Download a captured request profile (Admin only)"""
+    user, error = _admin_from_headers(request, 'Only superusers can view profiles')
+    if error:
+        return error
+    path = profiling.profile_path(name)
+    if path is None:
+        return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 Script to view database contents
+
+For full dumps use `python manage.py export_data`, which streams rows
+instead of loading whole tables.
 """
 
 import os
@@ -9,10 +12,11 @@ import django
 
 # Setup Django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'politics_backend.settings')
-sys.path.append('/Users/manibharadwaj/Developer/compnay/cloned/politics/politics_backend/politics_backend')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'politics_backend'))
 django.setup()
 
 from users.models import User
+from users import counters
 from django.contrib.auth.models import User as AuthUser
 from rest_framework.authtoken.models import Token
 
@@ -36,7 +40,7 @@ def view_database():
     
     # View tokens
     print("\n2️⃣  API Tokens (authtoken_token table):")
-    tokens = Token.objects.all()
+    tokens = Token.objects.select_related('user')
     for token in tokens:
         print(f"   • Token: {token.key[:10]}...")
         print(f"     User: {token.user.email}")
@@ -54,13 +58,15 @@ def view_database():
     for user in approved_users:
         print(f"   • {user.email} (User: {user.is_user})")
     
+    # Totals come from the maintained counters instead of COUNT(*) scans
+    stats = counters.snapshot()
     print(f"\n📊 SUMMARY:")
-    print(f"   Total Users: {User.objects.count()}")
-    print(f"   Pending Users: {pending_users.count()}")
-    print(f"   Approved Users: {approved_users.count()}")
-    print(f"   User Role Users: {User.objects.filter(is_user=True).count()}")
-    print(f"   Superusers: {User.objects.filter(is_superuser=True).count()}")
-    print(f"   Active Tokens: {Token.objects.count()}")
+    print(f"   Total Users: {stats[counters.USERS_TOTAL]}")
+    print(f"   Pending Users: {stats[counters.USERS_PENDING]}")
+    print(f"   Approved Users: {stats[counters.USERS_APPROVED]}")
+    print(f"   User Role Users: {stats[counters.USERS_IS_USER]}")
+    print(f"   Superusers: {stats[counters.USERS_SUPERUSER]}")
+    print(f"   Active Tokens: {stats[counters.TOKENS_TOTAL]}")
 
 if __name__ == "__main__":
     view_database()